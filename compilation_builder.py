@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+복습 영상 생성 스크립트
+이미 렌더링된 일일 영상의 문장 구간을 재인코딩 없이 모아 주간/월간 복습 영상을 만듭니다.
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime
+from src.core.config import config
+from src.services.compilation_service import CompilationService
+from src.utils.data_loader import DataLoader
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build review videos from previously rendered daily videos"
+    )
+    parser.add_argument(
+        "--videos",
+        nargs="+",
+        default=[],
+        help="Rendered videos to take every sentence from"
+    )
+    parser.add_argument(
+        "--sentences",
+        help="CSV/JSON/Excel file with sentences to look up in rendered videos"
+    )
+    parser.add_argument(
+        "--from",
+        dest="start_date",
+        help="Include videos rendered on or after this date (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--to",
+        dest="end_date",
+        help="Include videos rendered on or before this date (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output video filename (auto-generated if not specified)"
+    )
+    parser.add_argument(
+        "--title",
+        default="Weekly English Review",
+        help="Intro title"
+    )
+    parser.add_argument(
+        "-m", "--music",
+        default="calm",
+        choices=["calm", "upbeat", "inspiring"],
+        help="Background music style (default: calm)"
+    )
+    
+    args = parser.parse_args()
+    
+    sentences = None
+    if args.sentences:
+        sentences = [en for en, _ in DataLoader.load_sentences(args.sentences)]
+    
+    start_date = datetime.strptime(args.start_date, "%Y-%m-%d").date() if args.start_date else None
+    end_date = datetime.strptime(args.end_date, "%Y-%m-%d").date() if args.end_date else None
+    
+    if not (args.videos or sentences or start_date or end_date):
+        print("❌ Error: Specify --videos, --sentences or a date range")
+        parser.print_help()
+        sys.exit(1)
+    
+    output_name = args.output or f"english_review_{datetime.now().strftime('%Y%m%d')}.mp4"
+    output_path = os.path.join(config.video_output_dir, output_name)
+    
+    service = CompilationService()
+    segments = service.find_segments(args.videos, sentences, start_date, end_date)
+    print(f"📚 Found {len(segments)} rendered sentence segments")
+    
+    if not segments:
+        print("❌ Error: No rendered segments matched")
+        sys.exit(1)
+    
+    video_path = service.build_compilation(
+        segments, output_path,
+        title=args.title,
+        subtitle=f"{len(segments)} Sentences Review",
+        music_style=args.music
+    )
+    print(f"🎉 Compilation created: {video_path}")
+
+
+if __name__ == "__main__":
+    main()
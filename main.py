@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import os
 import sys
+import math
 import argparse
 from datetime import datetime
 from src.core.config import config
@@ -8,13 +9,66 @@ from src.services.tts_service import TTSService
 from src.services.image_service import ImageService
 from src.services.music_service import MusicService
 from src.services.video_service import VideoService
+from src.services.audio_export_service import AudioExportService
 from src.utils.data_loader import DataLoader
 from src.utils.youtube_metadata import YouTubeMetadata
 from src.utils.thumbnail_generator import generate_thumbnail_from_video_path
+from src.utils.clip_extractor import extract_sentence_clips
+from src.utils.audio_index import audio_index
+from src.utils.render_budget import parse_deadline
+from src.utils.timeline import plan_lesson_duration
+
+
+def parse_sentence_numbers(value: str, sentence_count: int) -> list:
+    """
+    Parse comma-separated 1-based sentence numbers into 0-based indices.
+    
+    Raises:
+        ValueError: For non-numbers or numbers outside 1..sentence_count
+    """
+    indices = []
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        try:
+            number = int(part)
+        except ValueError:
+            raise ValueError(f"'{part.strip()}' is not a sentence number")
+        if not 1 <= number <= sentence_count:
+            raise ValueError(f"sentence {number} is out of range (1-{sentence_count})")
+        indices.append(number - 1)
+    return indices
+
+
+def audio_output_name(output_name: str, audio_format: str) -> str:
+    """
+    Resolve the audio lesson file name from -o and the audio format.
+    
+    A name without an extension gets the format's extension; the encoder
+    follows the extension, so any other extension is rejected.
+    
+    Raises:
+        ValueError: For an unsupported format or a mismatched extension
+    """
+    if audio_format not in AudioExportService.FORMATS:
+        raise ValueError(f"unsupported audio format '{audio_format}' "
+                         f"(use {' or '.join(AudioExportService.FORMATS)})")
+    if not output_name:
+        date_str = datetime.now().strftime("%Y%m%d")
+        return f"english_study_{date_str}.{audio_format}"
+    
+    ext = os.path.splitext(output_name)[1].lower()
+    if not ext:
+        return f"{output_name}.{audio_format}"
+    if ext != f".{audio_format}":
+        raise ValueError(f"'{output_name}' does not match the {audio_format} audio format")
+    return output_name
 
 
 def create_video(input_file: str, output_name: str = None, 
-                 theme: str = "nature", music_style: str = "calm"):
+                 theme: str = "nature", music_style: str = "calm",
+                 shorts: str = None, output_mode: str = None,
+                 deadline: datetime = None):
     """
     Create a video from sentence data.
     
@@ -23,6 +77,11 @@ def create_video(input_file: str, output_name: str = None,
         output_name: Name for output video (auto-generated if None)
         theme: Theme for background images
         music_style: Style of background music
+        shorts: Also render a 9:16 short; "auto" or comma-separated
+            sentence numbers (1-based)
+        output_mode: mp4, fmp4 or hls (defaults to config.video_output_mode)
+        deadline: Wall-clock time the main video must be ready by; render
+            quality is lowered as needed to make it
     """
     print(f"🎬 Starting video creation process...")
     
@@ -35,7 +94,7 @@ def create_video(input_file: str, output_name: str = None,
     tts_service = TTSService()
     image_service = ImageService()
     music_service = MusicService()
-    video_service = VideoService()
+    video_service = VideoService(output_mode=output_mode)
     youtube_metadata = YouTubeMetadata()
     
     # Create output filename if not provided
@@ -47,9 +106,13 @@ def create_video(input_file: str, output_name: str = None,
     
     # Generate audio files
     print(f"🎙️ Generating audio files...")
-    audio_files = tts_service.generate_sentence_audio(
-        sentences, config.audio_output_dir
-    )
+    try:
+        audio_files = tts_service.generate_sentence_audio(
+            sentences, config.audio_output_dir
+        )
+    finally:
+        # Synthesis is done (or failed); don't leave hedge pool threads behind
+        tts_service.close()
     print(f"✅ Generated {len(audio_files) * 2} audio files")
     
     # Get background images
@@ -59,17 +122,37 @@ def create_video(input_file: str, output_name: str = None,
     
     # Get background music
     print(f"🎵 Preparing background music...")
-    estimated_duration = len(sentences) * (config.sentence_display_time + 2)
+    # Exact lesson length from the indexed narration durations
+    estimated_duration = math.ceil(plan_lesson_duration(audio_files, audio_index.duration))
     music_path = music_service.get_background_music(estimated_duration, music_style)
     print(f"✅ Background music ready")
     
     # Create video
     print(f"🎥 Creating video...")
     video_path = video_service.create_full_video(
-        sentences, audio_files, image_paths, music_path, output_path
+        sentences, audio_files, image_paths, music_path, output_path,
+        deadline=deadline, tts_engines=tts_service.served_by,
+        image_sources=image_service.image_sources
     )
     print(f"✅ Video created: {video_path}")
     
+    # Create vertical short from the same assets
+    shorts_path = None
+    if shorts:
+        print(f"📱 Creating vertical short...")
+        sentence_indices = None
+        if shorts != "auto":
+            sentence_indices = parse_sentence_numbers(shorts, len(sentences))
+        shorts_path = VideoService(layout="vertical").create_shorts_video(
+            sentences, audio_files, image_paths, music_path,
+            output_path.replace('.mp4', '_shorts.mp4'),
+            sentence_indices=sentence_indices
+        )
+        print(f"✅ Short created: {shorts_path}")
+    
+    # Every mix is done; free the narration kept in memory
+    tts_service.release_audio(audio_files)
+    
     # Generate YouTube metadata
     print(f"📝 Generating YouTube metadata...")
     metadata = youtube_metadata.generate_metadata(
@@ -93,12 +176,75 @@ def create_video(input_file: str, output_name: str = None,
     
     print(f"\n🎉 Video creation complete!")
     print(f"📹 Video: {video_path}")
+    if shorts_path:
+        print(f"📱 Short: {shorts_path}")
     print(f"📄 Metadata: {metadata_path}")
     print(f"🖼️ Thumbnail: {thumbnail_path}")
     
     return video_path, metadata
 
 
+def create_audio_lesson(input_file: str, output_name: str = None,
+                        music_style: str = "calm", audio_format: str = "mp3"):
+    """
+    Create an audio-only lesson (podcast episode) from sentence data.
+    
+    No images are collected and no video frames are rendered.
+    
+    Args:
+        input_file: Path to CSV/JSON/Excel file with sentences
+        output_name: Name for output audio file (auto-generated if None;
+            the format's extension is added if missing)
+        music_style: Style of background music
+        audio_format: "mp3" or "m4a"
+    """
+    print(f"🎧 Starting audio lesson creation...")
+    
+    # Checked before any synthesis or mixing is done
+    output_name = audio_output_name(output_name, audio_format)
+    
+    # Load sentences
+    print(f"📚 Loading sentences from: {input_file}")
+    sentences = DataLoader.load_sentences(input_file)
+    print(f"✅ Loaded {len(sentences)} sentence pairs")
+    
+    tts_service = TTSService()
+    music_service = MusicService()
+    audio_export_service = AudioExportService()
+    
+    output_path = os.path.join(config.audio_output_dir, output_name)
+    
+    # Generate audio files
+    print(f"🎙️ Generating audio files...")
+    try:
+        audio_files = tts_service.generate_sentence_audio(
+            sentences, config.audio_output_dir
+        )
+    finally:
+        # Synthesis is done (or failed); don't leave hedge pool threads behind
+        tts_service.close()
+    print(f"✅ Generated {len(audio_files) * 2} audio files")
+    
+    # Get background music
+    print(f"🎵 Preparing background music...")
+    estimated_duration = math.ceil(plan_lesson_duration(audio_files, audio_index.duration,
+                                                        with_bookends=False))
+    music_path = music_service.get_background_music(estimated_duration, music_style)
+    print(f"✅ Background music ready")
+    
+    # Mix and export with chapters
+    print(f"🎚️ Mixing audio lesson...")
+    audio_path = audio_export_service.create_audio_lesson(
+        sentences, audio_files, music_path, output_path
+    )
+    tts_service.release_audio(audio_files)
+    
+    print(f"\n🎉 Audio lesson complete!")
+    print(f"🎧 Audio: {audio_path}")
+    
+    return audio_path
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Create English study videos for YouTube"
@@ -124,6 +270,36 @@ def main():
         choices=["calm", "upbeat", "inspiring"],
         help="Background music style (default: calm)"
     )
+    parser.add_argument(
+        "--shorts",
+        nargs="?",
+        const="auto",
+        metavar="NUMBERS",
+        help="Also create a 9:16 short; optionally pick sentences, e.g. 1,3,5"
+    )
+    parser.add_argument(
+        "--output-mode",
+        choices=["mp4", "fmp4", "hls"],
+        help="mp4, fragmented MP4 or HLS segments that are usable while rendering "
+             "(default: VIDEO_OUTPUT_MODE or mp4)"
+    )
+    parser.add_argument(
+        "--deadline",
+        help="Finish rendering by this time (HH:MM today or YYYY-MM-DDTHH:MM), "
+             "lowering render quality if needed"
+    )
+    parser.add_argument(
+        "--audio-only",
+        nargs="?",
+        const="mp3",
+        choices=list(AudioExportService.FORMATS),
+        help="Export an audio-only lesson with chapter markers instead of a video"
+    )
+    parser.add_argument(
+        "--extract-clips",
+        metavar="VIDEO",
+        help="Cut each sentence of a rendered video into its own file (no re-encoding)"
+    )
     parser.add_argument(
         "--sample",
         action="store_true",
@@ -141,6 +317,19 @@ def main():
         print(f"  python main.py {sample_path}")
         return
     
+    # Extract sentence clips from an existing video if requested
+    if args.extract_clips:
+        if not os.path.exists(args.extract_clips):
+            print(f"❌ Error: Video file not found: {args.extract_clips}")
+            sys.exit(1)
+        
+        print(f"✂️ Extracting sentence clips from: {args.extract_clips}")
+        clip_paths = extract_sentence_clips(args.extract_clips)
+        for clip_path in clip_paths:
+            print(f"  {clip_path}")
+        print(f"✅ Extracted {len(clip_paths)} clips")
+        return
+    
     # Check if input is provided when not creating sample
     if not args.input:
         print(f"❌ Error: Input file is required unless using --sample")
@@ -152,12 +341,37 @@ def main():
         print(f"❌ Error: Input file not found: {args.input}")
         sys.exit(1)
     
+    # Validate short sentence numbers before any work is done
+    if args.shorts and args.shorts != "auto" and not args.audio_only:
+        try:
+            parse_sentence_numbers(args.shorts, len(DataLoader.load_sentences(args.input)))
+        except ValueError as e:
+            parser.error(f"--shorts: {e}")
+    
+    if args.audio_only:
+        try:
+            audio_output_name(args.output, args.audio_only)
+        except ValueError as e:
+            parser.error(f"--output: {e}")
+    
     try:
+        if args.audio_only:
+            create_audio_lesson(
+                args.input,
+                args.output,
+                args.music,
+                args.audio_only
+            )
+            return
+        
         create_video(
             args.input,
             args.output,
             args.theme,
-            args.music
+            args.music,
+            args.shorts,
+            args.output_mode,
+            parse_deadline(args.deadline) if args.deadline else None
         )
     except Exception as e:
         import traceback
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+렌더링 회귀 검사 스크립트
+고정 픽스처를 로컬 TTS와 고정 시드로 렌더링하고, 정해진 시각의 프레임을 골든 프레임과 비교합니다.
+렌더링 엔진 최적화가 출력 화면을 바꾸지 않았는지 확인하고 백엔드별 소요 시간을 기록합니다.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import atexit
+import random
+import shutil
+import argparse
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Tuple
+import numpy as np
+from PIL import Image
+from moviepy.editor import VideoFileClip
+from src.core.config import config
+from src.services.tts_service import LocalTTS, TTSService
+from src.services.video_service import VideoService
+from src.utils.audio_index import audio_index
+from src.utils.data_loader import DataLoader
+
+SEED = 20250731
+DEFAULT_FIXTURE = "data/week_1_20250731"
+SAMPLE_POINTS = [0.1, 0.35, 0.6, 0.85]  # Fractions of each clip's duration
+
+# Per backend: (per-pixel tolerance, share of pixels allowed beyond it, minimum PSNR in dB)
+BACKENDS = {
+    "compose": (2, 0.001, 45.0),  # Frames straight from the compositor
+    "encode": (48, 0.01, 32.0),   # Frames decoded back from the H.264 encode (edges ring)
+}
+
+
+def isolate_caches() -> str:
+    """
+    Point the asset arena, TTS cache and audio index at a fresh temporary
+    directory (removed at exit), so a check neither reads nor fills the
+    production caches.
+
+    Returns:
+        The temporary directory
+    """
+    run_dir = tempfile.mkdtemp(prefix="render_check_")
+    atexit.register(shutil.rmtree, run_dir, True)
+    config.asset_arena_dir = os.path.join(run_dir, "arena")
+    config.tts_cache_dir = os.path.join(run_dir, "tts_cache")
+    config.audio_index_path = os.path.join(run_dir, "audio_index.json")
+    audio_index.index_path = config.audio_index_path
+    return run_dir
+
+
+def make_fixture_background(path: str, index: int) -> str:
+    """Write a seeded, lossless background image for one sentence."""
+    if os.path.exists(path):
+        return path
+
+    rng = np.random.RandomState(SEED + index)
+    width, height = 1920, 1080
+
+    top, bottom = rng.randint(0, 256, size=(2, 3))
+    ratio = np.linspace(0, 1, height)[:, None, None]
+    img = top + (bottom - top) * ratio
+    img = np.broadcast_to(img, (height, width, 3)).copy()
+
+    # A few soft discs so crops and zooms have detail to compare
+    yy, xx = np.mgrid[0:height, 0:width]
+    for _ in range(4):
+        cx, cy, radius = rng.randint(0, width), rng.randint(0, height), rng.randint(80, 300)
+        weight = np.clip(1 - np.hypot(xx - cx, yy - cy) / radius, 0, 1)[:, :, None]
+        img = img * (1 - 0.5 * weight) + rng.randint(0, 256, size=3) * 0.5 * weight
+
+    Image.fromarray(img.astype(np.uint8)).save(path)
+    return path
+
+
+def load_fixture(fixture: str, sentence_count: int) -> List[Tuple[str, str]]:
+    """Load the first sentences of a fixture file (or the first file of a directory)."""
+    if os.path.isdir(fixture):
+        files = sorted(f for f in os.listdir(fixture) if f.endswith(".csv"))
+        fixture = os.path.join(fixture, files[0])
+    return DataLoader.load_sentences(fixture)[:sentence_count]
+
+
+def build_clips(sentences: List[Tuple[str, str]], work_dir: str,
+                run_dir: str) -> List[Tuple[str, object]]:
+    """Create the fixture's sentence clips and outro with fixed seeds."""
+    audio_dir = os.path.join(run_dir, "audio")
+    os.makedirs(audio_dir, exist_ok=True)
+
+    audio_files = TTSService(engine=LocalTTS(latency=0, jitter=0)).generate_sentence_audio(sentences, audio_dir)
+    video_service = VideoService(output_mode="mp4")
+
+    clips = []
+    for i, ((en_text, ko_text), (en_audio, ko_audio)) in enumerate(zip(sentences, audio_files)):
+        background = make_fixture_background(os.path.join(work_dir, f"background_{i}.png"), i)
+        random.seed(SEED + i)
+        np.random.seed(SEED + i)
+        clip = video_service.create_sentence_clip(background, en_audio, ko_audio,
+                                                  en_text, ko_text, i + 1)
+        clips.append((f"sentence_{i + 1:02d}", clip))
+
+    # The intro palette follows the time of day, so only the outro is checked
+    random.seed(SEED)
+    np.random.seed(SEED)
+    clips.append(("outro", video_service.create_outro_clip()))
+
+    return clips
+
+
+def sample_times(duration: float) -> List[int]:
+    """Frame numbers to compare, on the output frame grid."""
+    fps = VideoService.OUTPUT_FPS
+    last_frame = math.floor(duration * fps) - 1
+    return [min(last_frame, round(duration * point * fps)) for point in SAMPLE_POINTS]
+
+
+def render_compose(name: str, clip, frame_numbers: List[int], work_dir: str) -> Dict[int, np.ndarray]:
+    """Compose frames directly, without encoding."""
+    fps = VideoService.OUTPUT_FPS
+    return {n: clip.get_frame(n / fps) for n in frame_numbers}
+
+
+def render_encode(name: str, clip, frame_numbers: List[int], work_dir: str) -> Dict[int, np.ndarray]:
+    """Encode the clip like a full video and decode the sampled frames back."""
+    fps = VideoService.OUTPUT_FPS
+    video_path = VideoService(output_mode="mp4").render_segment(
+        clip, os.path.join(work_dir, f"{name}.mp4"))
+
+    decoded = VideoFileClip(video_path, audio=False)
+    try:
+        return {n: decoded.get_frame(n / fps) for n in frame_numbers}
+    finally:
+        decoded.close()
+
+
+RENDERERS = {
+    "compose": render_compose,
+    "encode": render_encode,
+}
+
+
+def compare_frames(frame: np.ndarray, golden: np.ndarray, tolerance: int) -> dict:
+    """Per-pixel and PSNR comparison of a rendered frame with its golden frame."""
+    if frame.shape != golden.shape:
+        return {"max_diff": 255, "bad_ratio": 1.0, "psnr": 0.0}
+
+    diff = np.abs(frame.astype(np.int16) - golden.astype(np.int16))
+    mse = float(np.mean(diff.astype(np.float64) ** 2))
+    psnr = float("inf") if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+    return {
+        "max_diff": int(diff.max()),
+        "bad_ratio": float(np.mean(diff.max(axis=2) > tolerance)),
+        "psnr": psnr
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare rendered frames of a fixed fixture against golden frames"
+    )
+    parser.add_argument(
+        "--fixture",
+        default=DEFAULT_FIXTURE,
+        help=f"Sentence file or directory (first file is used, default: {DEFAULT_FIXTURE})"
+    )
+    parser.add_argument(
+        "-n", "--sentences",
+        type=int,
+        default=3,
+        help="Number of fixture sentences to render (default: 3)"
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=list(BACKENDS),
+        choices=list(BACKENDS),
+        help="Render backends to check (default: all)"
+    )
+    parser.add_argument(
+        "--golden-dir",
+        help="Golden frame directory (default: <OUTPUT_DIR>/golden/<fixture>)"
+    )
+    parser.add_argument(
+        "--update-golden",
+        action="store_true",
+        help="Store the compose backend's frames as the new golden frames"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=int,
+        help="Override the per-pixel tolerance of every backend"
+    )
+    parser.add_argument(
+        "--psnr",
+        type=float,
+        help="Override the minimum PSNR (dB) of every backend"
+    )
+
+    args = parser.parse_args()
+
+    fixture_name = os.path.splitext(os.path.basename(os.path.normpath(args.fixture)))[0]
+    work_dir = os.path.join(config.output_dir, "render_check", fixture_name)
+    golden_dir = args.golden_dir or os.path.join(config.output_dir, "golden", fixture_name)
+    os.makedirs(work_dir, exist_ok=True)
+    run_dir = isolate_caches()
+
+    sentences = load_fixture(args.fixture, args.sentences)
+    print(f"📚 Rendering {len(sentences)} fixture sentences from {args.fixture}")
+    clips = build_clips(sentences, work_dir, run_dir)
+
+    backends = ["compose"] if args.update_golden else args.backends
+    report = {
+        "fixture": args.fixture,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "backends": {}
+    }
+    failed = False
+
+    for backend in backends:
+        tolerance, max_bad_ratio, min_psnr = BACKENDS[backend]
+        tolerance = args.tolerance if args.tolerance is not None else tolerance
+        min_psnr = args.psnr if args.psnr is not None else min_psnr
+
+        results = []
+        started = time.monotonic()
+        for name, clip in clips:
+            frames = RENDERERS[backend](name, clip, sample_times(clip.duration), work_dir)
+
+            for frame_number, frame in frames.items():
+                golden_path = os.path.join(golden_dir, f"{name}_{frame_number:05d}.png")
+
+                if args.update_golden:
+                    os.makedirs(golden_dir, exist_ok=True)
+                    Image.fromarray(frame).save(golden_path)
+                    continue
+
+                if not os.path.exists(golden_path):
+                    print(f"❌ Missing golden frame: {golden_path} (run with --update-golden)")
+                    sys.exit(1)
+
+                result = compare_frames(frame, np.array(Image.open(golden_path).convert('RGB')),
+                                        tolerance)
+                result["frame"] = f"{name}_{frame_number:05d}"
+                result["passed"] = (result["psnr"] >= min_psnr and
+                                    result["bad_ratio"] <= max_bad_ratio)
+                results.append(result)
+        elapsed = time.monotonic() - started
+
+        report["backends"][backend] = {
+            "seconds": round(elapsed, 2),
+            "tolerance": tolerance,
+            "max_bad_ratio": max_bad_ratio,
+            "min_psnr": min_psnr,
+            "frames": [{**r, "psnr": None if math.isinf(r["psnr"]) else round(r["psnr"], 2)}
+                       for r in results]
+        }
+
+        if args.update_golden:
+            print(f"✅ Golden frames updated in {golden_dir} ({elapsed:.1f}s)")
+            continue
+
+        mismatched = [r for r in results if not r["passed"]]
+        failed = failed or bool(mismatched)
+        status = "✅" if not mismatched else "❌"
+        print(f"{status} {backend}: {len(results) - len(mismatched)}/{len(results)} frames match "
+              f"({elapsed:.1f}s)")
+        for r in mismatched:
+            print(f"   {r['frame']}: PSNR {r['psnr']:.1f} dB, max diff {r['max_diff']}, "
+                  f"{r['bad_ratio']:.2%} pixels over tolerance")
+
+    report_path = os.path.join(work_dir, "report.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📄 Report: {report_path}")
+
+    for _, clip in clips:
+        clip.close()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,10 @@ import time
 from datetime import datetime
 import subprocess
 import logging
+from src.core.config import config
+from src.utils.clip_extractor import load_timeline
 from src.utils.data_loader import DataLoader
+from src.utils.placeholder_pool import PlaceholderPool
 
 
 # Configure logging
@@ -20,8 +23,12 @@ logging.basicConfig(
 
 
 class VideoScheduler:
-    def __init__(self, data_directory: str = "data/daily_sentences"):
+    def __init__(self, data_directory: str = "data/daily_sentences",
+                 deadline: str = None, theme: str = "nature"):
         self.data_directory = data_directory
+        self.theme = theme
+        # HH:MM the daily video must be ready by (None waits however long it takes)
+        self.deadline = deadline or config.render_deadline
         self.processed_directory = os.path.join(data_directory, "processed")
         os.makedirs(self.processed_directory, exist_ok=True)
         
@@ -57,14 +64,18 @@ class VideoScheduler:
                 "python", "main.py",
                 data_file,
                 "-o", output_name,
-                "-t", "nature",  # You can randomize theme
+                "-t", self.theme,  # You can randomize theme
                 "-m", "calm"     # You can randomize music
             ]
+            if self.deadline:
+                cmd += ["--deadline", self.deadline]
+                logging.info(f"Render deadline: {self.deadline}")
             
             result = subprocess.run(cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
                 logging.info(f"Video created successfully: {output_name}")
+                self.log_render_quality(output_name)
                 
                 # Move processed file
                 processed_path = os.path.join(
@@ -83,6 +94,36 @@ class VideoScheduler:
         except Exception as e:
             logging.error(f"Error creating video: {str(e)}")
     
+    def log_render_quality(self, output_name: str):
+        """Log placeholder backgrounds and the quality degradations needed to meet the deadline."""
+        try:
+            timeline = load_timeline(os.path.join(config.video_output_dir, output_name))
+        except FileNotFoundError:
+            return
+        
+        placeholders = sum(1 for seg in timeline.get("segments", [])
+                           if seg.get("background") == "placeholder")
+        if placeholders:
+            logging.warning(f"{placeholders} sentences use placeholder backgrounds "
+                            f"(Unsplash failed or the image stage ran out of time)")
+        
+        render = timeline.get("render", {})
+        if render.get("degradations"):
+            logging.warning(f"Rendered with degradations to meet deadline: "
+                            f"{', '.join(render['degradations'])} "
+                            f"({render.get('render_seconds')}s)")
+        else:
+            logging.info(f"Rendered at full quality ({render.get('render_seconds')}s)")
+    
+    def top_up_placeholders(self, budget: float = 20):
+        """Pre-generate offline placeholder backgrounds while idle (budget in seconds)."""
+        try:
+            created = PlaceholderPool().top_up([self.theme], budget)
+            if created:
+                logging.info(f"Generated {created} placeholder backgrounds for '{self.theme}'")
+        except Exception as e:
+            logging.warning(f"Placeholder pool top-up failed: {str(e)}")
+    
     def upload_to_youtube(self, video_path: str):
         """
         Upload video to YouTube (requires YouTube API setup).
@@ -109,6 +150,7 @@ class VideoScheduler:
         
         while True:
             schedule.run_pending()
+            self.top_up_placeholders()
             time.sleep(60)  # Check every minute
 
 
@@ -171,6 +213,10 @@ if __name__ == "__main__":
         action="store_true",
         help="Run video creation once and exit"
     )
+    parser.add_argument(
+        "--deadline",
+        help="Time (HH:MM) the daily video must be ready by (default: RENDER_DEADLINE)"
+    )
     
     args = parser.parse_args()
     
@@ -178,8 +224,8 @@ if __name__ == "__main__":
         create_sample_schedule_data()
         print("Sample data created in data/daily_sentences/")
     elif args.run_once:
-        scheduler = VideoScheduler()
+        scheduler = VideoScheduler(deadline=args.deadline)
         scheduler.create_daily_video()
     else:
-        scheduler = VideoScheduler()
+        scheduler = VideoScheduler(deadline=args.deadline)
         scheduler.run()
\ No newline at end of file
@@ -14,11 +14,22 @@ class Config:
     azure_speech_region: Optional[str] = os.getenv("AZURE_SPEECH_REGION")
     youtube_api_key: Optional[str] = os.getenv("YOUTUBE_API_KEY")
     
+    # Service endpoints (point them at standin_server.py for offline benchmarks)
+    unsplash_api_url: str = os.getenv("UNSPLASH_API_URL", "https://api.unsplash.com")
+    bensound_url: str = os.getenv("BENSOUND_URL", "https://www.bensound.com")
+    azure_tts_endpoint: str = os.getenv("AZURE_TTS_ENDPOINT", "")  # Empty: the region's endpoint
+    gtts_url: str = os.getenv("GTTS_URL", "")  # Empty: Google Translate
+    
     # Directories
     output_dir: str = os.getenv("OUTPUT_DIR", "output")
     video_output_dir: str = os.path.join(output_dir, "videos")
     audio_output_dir: str = os.path.join(output_dir, "audio")
+    tts_cache_dir: str = os.path.join(audio_output_dir, "tts_cache")
+    audio_index_path: str = os.path.join(audio_output_dir, "audio_index.json")
     image_output_dir: str = os.path.join(output_dir, "images")
+    image_search_cache_dir: str = os.path.join(image_output_dir, "search_cache")
+    placeholder_pool_dir: str = os.path.join(image_output_dir, "placeholders")
+    asset_arena_dir: str = os.path.join(output_dir, "arena")
     
     # Video Settings
     video_width: int = int(os.getenv("VIDEO_WIDTH", "1920"))
@@ -26,12 +37,49 @@ class Config:
     video_fps: int = int(os.getenv("VIDEO_FPS", "24"))
     sentence_display_time: int = int(os.getenv("SENTENCE_DISPLAY_TIME", "8"))
     transition_time: int = int(os.getenv("TRANSITION_TIME", "1"))
+    video_output_mode: str = os.getenv("VIDEO_OUTPUT_MODE", "mp4")  # mp4, fmp4, hls
+    progressive_segment_time: int = int(os.getenv("PROGRESSIVE_SEGMENT_TIME", "4"))
+    render_deadline: Optional[str] = os.getenv("RENDER_DEADLINE")  # HH:MM the daily video must be ready by
+    asset_arena_max_mb: int = int(os.getenv("ASSET_ARENA_MAX_MB", "2000"))  # Decoded backgrounds
+    
+    # Shorts Settings
+    shorts_sentence_count: int = int(os.getenv("SHORTS_SENTENCE_COUNT", "3"))
     
     # TTS Settings
     tts_engine: str = os.getenv("TTS_ENGINE", "azure")
+    tts_engine_en: str = os.getenv("TTS_ENGINE_EN", os.getenv("TTS_ENGINE", "azure"))
+    tts_engine_ko: str = os.getenv("TTS_ENGINE_KO", os.getenv("TTS_ENGINE", "azure"))
+    tts_hedge_engine: str = os.getenv("TTS_HEDGE_ENGINE", "")  # Empty disables hedging
+    tts_hedge_percentile: float = float(os.getenv("TTS_HEDGE_PERCENTILE", "95"))
+    tts_hedge_delay: float = float(os.getenv("TTS_HEDGE_DELAY", "5.0"))  # Until latencies are known
+    tts_local_latency: float = float(os.getenv("TTS_LOCAL_LATENCY", "0.0"))  # Simulated, seconds
+    tts_local_latency_jitter: float = float(os.getenv("TTS_LOCAL_LATENCY_JITTER", "0.0"))
     tts_voice_en: str = os.getenv("TTS_VOICE_EN", "en-US-JennyNeural")
     tts_voice_ko: str = os.getenv("TTS_VOICE_KO", "ko-KR-SunHiNeural")
     tts_speed: float = float(os.getenv("TTS_SPEED", "1.0"))
+    tts_max_in_flight: int = int(os.getenv("TTS_MAX_IN_FLIGHT", "8"))
+    tts_max_retries: int = int(os.getenv("TTS_MAX_RETRIES", "3"))
+    tts_request_timeout: float = float(os.getenv("TTS_REQUEST_TIMEOUT", "60"))  # Seconds, per engine request
+    tts_batch_ssml: bool = os.getenv("TTS_BATCH_SSML", "false").lower() == "true"
+    azure_synthesizer_pool_size: int = int(os.getenv("AZURE_SYNTHESIZER_POOL_SIZE", "4"))  # Per voice
+    tts_cache_enabled: bool = os.getenv("TTS_CACHE", "true").lower() == "true"
+    tts_cache_max_mb: int = int(os.getenv("TTS_CACHE_MAX_MB", "500"))
+    tts_write_audio: bool = os.getenv("TTS_WRITE_AUDIO", "true").lower() == "true"  # Without the cache
+    karaoke_highlight: bool = os.getenv("KARAOKE_HIGHLIGHT", "true").lower() == "true"
+    
+    # Image Settings
+    unsplash_per_page: int = int(os.getenv("UNSPLASH_PER_PAGE", "30"))  # Unsplash maximum
+    image_search_ttl_hours: float = float(os.getenv("IMAGE_SEARCH_TTL_HOURS", "24"))
+    # Don't repeat an image within this many days, searched or from the library
+    image_reuse_days: float = float(os.getenv("IMAGE_REUSE_DAYS", "30"))
+    unsplash_requests_per_hour: int = int(os.getenv("UNSPLASH_REQUESTS_PER_HOUR", "50"))  # API quota
+    image_download_workers: int = int(os.getenv("IMAGE_DOWNLOAD_WORKERS", "8"))
+    image_downloads_per_second: float = float(os.getenv("IMAGE_DOWNLOADS_PER_SECOND", "10"))
+    image_request_timeout: float = float(os.getenv("IMAGE_REQUEST_TIMEOUT", "30"))  # Seconds
+    image_stage_timeout: float = float(os.getenv("IMAGE_STAGE_TIMEOUT", "120"))  # Seconds, whole stage
+    image_breaker_failures: int = int(os.getenv("IMAGE_BREAKER_FAILURES", "3"))  # Consecutive
+    image_library_max_mb: int = int(os.getenv("IMAGE_LIBRARY_MAX_MB", "3000"))
+    placeholder_pool_size: int = int(os.getenv("PLACEHOLDER_POOL_SIZE", "10"))  # Per theme
     
     # Background Music
     music_volume: float = float(os.getenv("MUSIC_VOLUME", "0.1"))
@@ -40,7 +88,9 @@ class Config:
     def __post_init__(self):
         # Create directories if they don't exist
         for dir_path in [self.output_dir, self.video_output_dir, 
-                         self.audio_output_dir, self.image_output_dir]:
+                         self.audio_output_dir, self.image_output_dir,
+                         self.asset_arena_dir, self.tts_cache_dir,
+                         self.image_search_cache_dir, self.placeholder_pool_dir]:
             os.makedirs(dir_path, exist_ok=True)
 
 
@@ -0,0 +1,132 @@
+import os
+import math
+import tempfile
+import subprocess
+from typing import List, Optional, Tuple
+from pydub import AudioSegment
+from pydub.utils import get_encoder_name
+from src.core.config import config
+from src.utils.pcm_cache import pcm_segment
+from src.utils.timeline import plan_sentence_timing
+
+
+class AudioExportService:
+    """
+    Export a lesson as an audio episode without rendering any video frames.
+    
+    Uses the same sentence timeline as VideoService (English, Korean,
+    English repeat) and the same music bed level, and writes one chapter
+    per sentence.
+    """
+    
+    SAMPLE_RATE = 44100
+    FORMATS = ("mp3", "m4a")  # Output file extensions
+    
+    def create_audio_lesson(self, sentences: List[Tuple[str, str]],
+                            audio_files: List[Tuple[str, str]],
+                            background_music_path: Optional[str],
+                            output_path: str,
+                            title: str = "Daily English Study") -> str:
+        """
+        Mix the narration and music bed and write an MP3/M4A with chapters.
+        
+        Args:
+            sentences: List of (english, korean) sentence tuples
+            audio_files: List of (english_audio_path, korean_audio_path) tuples
+            background_music_path: Adjusted background music file
+            output_path: Destination .mp3 or .m4a file
+            title: Episode title stored in the file metadata
+        
+        Returns:
+            Path to the exported audio file
+        """
+        lesson = AudioSegment.empty().set_frame_rate(self.SAMPLE_RATE)
+        chapters = []
+        
+        for i, ((en_text, ko_text), (en_path, ko_path)) in enumerate(zip(sentences, audio_files)):
+            en_audio = pcm_segment(en_path)
+            ko_audio = pcm_segment(ko_path)
+            
+            timing = plan_sentence_timing(len(en_audio) / 1000, len(ko_audio) / 1000)
+            
+            section = AudioSegment.silent(duration=round(timing.total_duration * 1000),
+                                          frame_rate=self.SAMPLE_RATE)
+            section = section.overlay(en_audio, position=round(timing.en_audio_start * 1000))
+            section = section.overlay(ko_audio, position=round(timing.ko_audio_start * 1000))
+            section = section.overlay(en_audio, position=round(timing.en_repeat_audio_start * 1000))
+            
+            chapters.append((len(lesson), len(lesson) + len(section), f"{i + 1}. {en_text}"))
+            lesson += section
+        
+        lesson = self._add_background_music(lesson, background_music_path)
+        
+        return self._export_with_chapters(lesson, chapters, output_path, title)
+    
+    def _add_background_music(self, lesson: AudioSegment,
+                              background_music_path: Optional[str]) -> AudioSegment:
+        """Lay the music bed under the lesson like VideoService does."""
+        if not background_music_path or not os.path.exists(background_music_path):
+            print(f"⚠️ No background music path provided or file doesn't exist: {background_music_path}")
+            return lesson
+        
+        music = pcm_segment(background_music_path)
+        if len(music) < len(lesson):
+            music = music * (len(lesson) // len(music) + 1)
+        music = music[:len(lesson)]
+        
+        if config.music_volume <= 0:
+            return lesson
+        
+        music = music + 20 * math.log10(config.music_volume)
+        music = music.fade_in(2000).fade_out(2000)
+        
+        return lesson.overlay(music)
+    
+    def _export_with_chapters(self, lesson: AudioSegment, chapters: List[tuple],
+                              output_path: str, title: str) -> str:
+        """Encode the mix and attach per-sentence chapter markers."""
+        ext = os.path.splitext(output_path)[1].lower()
+        if ext == ".mp3":
+            codec_params = ['-c:a', 'libmp3lame', '-b:a', '192k', '-id3v2_version', '3']
+        elif ext == ".m4a":
+            codec_params = ['-c:a', 'aac', '-b:a', '192k']
+        else:
+            raise ValueError(f"Unsupported audio format: {ext}")
+        
+        with tempfile.TemporaryDirectory() as work_dir:
+            mix_path = os.path.join(work_dir, "lesson.wav")
+            lesson.export(mix_path, format="wav")
+            
+            metadata_path = os.path.join(work_dir, "chapters.txt")
+            with open(metadata_path, 'w', encoding='utf-8') as f:
+                f.write(";FFMETADATA1\n")
+                f.write(f"title={self._escape_metadata(title)}\n")
+                for start_ms, end_ms, chapter_title in chapters:
+                    f.write("[CHAPTER]\nTIMEBASE=1/1000\n")
+                    f.write(f"START={start_ms}\nEND={end_ms}\n")
+                    f.write(f"title={self._escape_metadata(chapter_title)}\n")
+            
+            result = subprocess.run([
+                get_encoder_name(),
+                '-y',
+                '-loglevel', 'error',
+                '-i', mix_path,
+                '-i', metadata_path,
+                '-map', '0:a',
+                '-map_metadata', '1',
+                '-map_chapters', '1',
+                *codec_params,
+                output_path
+            ], capture_output=True, text=True)
+        
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to export {output_path}: {result.stderr.strip()}")
+        
+        return output_path
+    
+    @staticmethod
+    def _escape_metadata(value: str) -> str:
+        """Escape characters that are special in ffmetadata files."""
+        for char in ('\\', '=', ';', '#', '\n'):
+            value = value.replace(char, '\\' + char)
+        return value
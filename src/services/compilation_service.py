@@ -0,0 +1,293 @@
+import os
+import re
+import json
+import glob
+import math
+import shutil
+import tempfile
+import subprocess
+from datetime import datetime, date
+from typing import List, Optional
+from moviepy.config import get_setting
+from pydub import AudioSegment
+from src.core.config import config
+from src.services.music_service import MusicService
+from src.services.video_service import VideoService
+from src.utils.clip_extractor import cut_segment, get_timeline_path, load_timeline
+
+
+class CompilationService:
+    """
+    Build review videos from sentence segments of previously rendered videos.
+    
+    Video frames are reused by stream copy; only the intro/outro (and
+    segments of videos rendered under a degraded profile) are encoded and
+    the narration is remixed over a new music bed.
+    """
+    
+    def __init__(self):
+        # Parts must be plain MP4 files for the concat demuxer
+        self.video_service = VideoService(output_mode="mp4")
+        self.music_service = MusicService()
+    
+    def find_segments(self, videos: Optional[List[str]] = None,
+                      sentences: Optional[List[str]] = None,
+                      start_date: Optional[date] = None,
+                      end_date: Optional[date] = None) -> List[dict]:
+        """
+        Locate already-encoded sentence segments.
+        
+        Args:
+            videos: Video paths to take every sentence from
+            sentences: English sentences to look up in all rendered videos
+            start_date: Include sentences of videos rendered on/after this date
+            end_date: Include sentences of videos rendered on/before this date
+        
+        Returns:
+            List of segment dictionaries in playback order
+        """
+        segments = []
+        
+        for video_path in videos or []:
+            segments.extend(self._video_segments(video_path))
+        
+        if sentences or start_date or end_date:
+            wanted = {self._normalize(text) for text in sentences or []}
+            seen = set()
+            
+            for video_path in self._rendered_videos():
+                timeline = load_timeline(video_path)
+                # Skip earlier compilations so sentences aren't picked twice
+                if timeline.get("kind") == "compilation":
+                    continue
+                # Only videos in the compilation's layout and frame size (not shorts)
+                if (timeline.get("layout", "landscape") != self.video_service.layout.name
+                        or [timeline["width"], timeline["height"]] != [self.video_service.width,
+                                                                     self.video_service.height]):
+                    continue
+                
+                created = datetime.fromisoformat(timeline["created_at"]).date()
+                in_range = ((start_date or end_date) and
+                            (not start_date or created >= start_date) and
+                            (not end_date or created <= end_date))
+                
+                for segment in self._video_segments(video_path, timeline):
+                    key = self._normalize(segment["english"])
+                    if key in seen:
+                        continue
+                    if in_range or key in wanted:
+                        segments.append(segment)
+                        seen.add(key)
+        
+        return segments
+    
+    def build_compilation(self, segments: List[dict], output_path: str,
+                          title: str = "Weekly English Review",
+                          subtitle: str = "Review with Us",
+                          music_style: str = "calm") -> str:
+        """
+        Join segments with a fresh intro/outro and a new music bed.
+        
+        Args:
+            segments: Segments returned by find_segments
+            output_path: Where to write the compilation
+            title: Intro title
+            subtitle: Intro subtitle
+            music_style: Style of the new background music
+        
+        Returns:
+            Path to the compilation video
+        """
+        if not segments:
+            raise ValueError("No segments to compile")
+        
+        fps = VideoService.OUTPUT_FPS
+        for segment in segments:
+            if segment["fps"] != fps or segment["size"] != [self.video_service.width,
+                                                            self.video_service.height]:
+                raise ValueError(f"Segment from {segment['video_path']} does not match "
+                                 f"the output format and cannot be stream-copied")
+        
+        work_dir = tempfile.mkdtemp(dir=config.video_output_dir)
+        try:
+            # Only the intro and outro are rendered
+            print(f"🎬 Rendering intro and outro...")
+            intro = self.video_service.create_intro_clip(title, subtitle)
+            outro = self.video_service.create_outro_clip()
+            intro_duration = math.ceil(intro.duration * fps - 1e-6) / fps
+            outro_duration = math.ceil(outro.duration * fps - 1e-6) / fps
+            intro_path = self.video_service.render_segment(intro, os.path.join(work_dir, "intro.mp4"))
+            outro_path = self.video_service.render_segment(outro, os.path.join(work_dir, "outro.mp4"))
+            
+            # Cut sentence segments by stream copy; segments encoded under
+            # another render profile (e.g. degraded for a deadline) are
+            # re-encoded to match the intro/outro
+            print(f"✂️ Collecting {len(segments)} sentence segments...")
+            profile = self.video_service.render_profile.name
+            parts = [intro_path]
+            reencoded = 0
+            for i, segment in enumerate(segments):
+                part_path = os.path.join(work_dir, f"segment_{i:04d}.mp4")
+                if segment["render_profile"] == profile:
+                    cut_segment(segment["video_path"], segment["start"], segment["end"],
+                                part_path, fps=fps, video_only=True)
+                else:
+                    self.video_service.reencode_segment(segment["video_path"], segment["start"],
+                                                        segment["end"], part_path)
+                    reencoded += 1
+                parts.append(part_path)
+            parts.append(outro_path)
+            if reencoded:
+                print(f"   Re-encoded {reencoded} segments rendered under another profile")
+            
+            concat_list = os.path.join(work_dir, "concat.txt")
+            with open(concat_list, 'w', encoding='utf-8') as f:
+                for part in parts:
+                    f.write(f"file '{os.path.abspath(part)}'\n")
+            
+            # Remix narration with a new music bed
+            print(f"🎵 Remixing audio...")
+            speech, timeline = self._assemble_speech(segments, intro_duration, outro_duration,
+                                                      output_path)
+            mix = self._mix_music(speech, music_style)
+            mix_path = os.path.join(work_dir, "mix.wav")
+            mix.export(mix_path, format="wav")
+            
+            cmd = [
+                get_setting("FFMPEG_BINARY"),
+                '-y',
+                '-loglevel', 'error',
+                '-f', 'concat',
+                '-safe', '0',
+                '-i', concat_list,
+                '-i', mix_path,
+                '-map', '0:v',
+                '-map', '1:a',
+                '-c:v', 'copy',
+                '-c:a', 'aac',
+                '-b:a', '192k',
+                '-shortest',
+                output_path
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg failed to join segments: {result.stderr.strip()}")
+            
+            # Sidecars so the compilation can itself be cut or compiled
+            speech_path = os.path.splitext(output_path)[0] + "_speech.m4a"
+            speech.export(speech_path, format="ipod", codec="aac", bitrate="192k")
+            timeline["speech_audio"] = os.path.basename(speech_path)
+            with open(get_timeline_path(output_path), 'w', encoding='utf-8') as f:
+                json.dump(timeline, f, ensure_ascii=False, indent=2)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+        return output_path
+    
+    def _assemble_speech(self, segments: List[dict], intro_duration: float,
+                         outro_duration: float, output_path: str):
+        """Concatenate segment narration and build the compilation timeline."""
+        speech = AudioSegment.silent(duration=round(intro_duration * 1000), frame_rate=44100)
+        timeline_segments = [{"type": "intro", "start": 0.0, "end": intro_duration}]
+        sources = {}
+        position = intro_duration
+        
+        for number, segment in enumerate(segments, 1):
+            source = segment["speech_path"] or segment["video_path"]
+            if source not in sources:
+                # Older videos have no speech track; fall back to their mixed audio
+                sources[source] = AudioSegment.from_file(source).set_frame_rate(44100)
+            
+            length = segment["end"] - segment["start"]
+            piece = sources[source][round(segment["start"] * 1000):round(segment["end"] * 1000)]
+            # Pad so audio stays aligned with the copied video frames
+            piece += AudioSegment.silent(duration=max(0, round(length * 1000) - len(piece)),
+                                         frame_rate=44100)
+            speech += piece
+            
+            timeline_segments.append({
+                "type": "sentence",
+                "number": number,
+                "english": segment["english"],
+                "korean": segment["korean"],
+                "source": os.path.basename(segment["video_path"]),
+                "start": round(position, 6),
+                "end": round(position + length, 6)
+            })
+            position += length
+        
+        speech += AudioSegment.silent(duration=round(outro_duration * 1000), frame_rate=44100)
+        timeline_segments.append({
+            "type": "outro",
+            "start": round(position, 6),
+            "end": round(position + outro_duration, 6)
+        })
+        
+        timeline = {
+            "video": os.path.basename(output_path),
+            "kind": "compilation",
+            "layout": self.video_service.layout.name,
+            "width": self.video_service.width,
+            "height": self.video_service.height,
+            "fps": VideoService.OUTPUT_FPS,
+            "duration": position + outro_duration,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "segments": timeline_segments
+        }
+        return speech, timeline
+    
+    def _mix_music(self, speech: AudioSegment, music_style: str) -> AudioSegment:
+        """Overlay a new music bed at the same level VideoService uses."""
+        music_path = self.music_service.get_background_music(
+            math.ceil(len(speech) / 1000), music_style
+        )
+        music = AudioSegment.from_file(music_path)
+        if config.music_volume > 0:
+            # VideoService scales the adjusted track by music_volume once more
+            music = music + 20 * math.log10(config.music_volume)
+            return speech.overlay(music)
+        return speech
+    
+    def _rendered_videos(self) -> List[str]:
+        """List rendered videos (any layout) that have a timeline sidecar."""
+        videos = []
+        for timeline_path in sorted(glob.glob(os.path.join(config.video_output_dir,
+                                                           "*_timeline.json"))):
+            video_path = timeline_path[:-len("_timeline.json")] + ".mp4"
+            if os.path.exists(video_path):
+                videos.append(video_path)
+        return videos
+    
+    def _video_segments(self, video_path: str, timeline: Optional[dict] = None) -> List[dict]:
+        """Return the sentence segments of one rendered video."""
+        if timeline is None:
+            timeline = load_timeline(video_path)
+        
+        speech_path = None
+        if timeline.get("speech_audio"):
+            speech_path = os.path.join(os.path.dirname(video_path), timeline["speech_audio"])
+            if not os.path.exists(speech_path):
+                speech_path = None
+        
+        segments = []
+        for segment in timeline["segments"]:
+            if segment["type"] != "sentence":
+                continue
+            segments.append({
+                "video_path": video_path,
+                "speech_path": speech_path,
+                "fps": timeline["fps"],
+                "size": [timeline["width"], timeline["height"]],
+                # Videos from before deadline rendering were all rendered at full quality
+                "render_profile": timeline.get("render", {}).get("profile", "full"),
+                "start": segment["start"],
+                "end": segment["end"],
+                "english": segment["english"],
+                "korean": segment["korean"]
+            })
+        return segments
+    
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Normalize a sentence for matching (case, spacing, end punctuation)."""
+        return re.sub(r"\s+", " ", text.strip().lower()).rstrip(".!?")
@@ -1,25 +1,72 @@
 import os
+import math
+import tempfile
+import threading
 import requests
-from typing import List, Optional
+from collections import Counter
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterator, List, Optional
 from src.core.config import config
+from src.services.video_service import LAYOUT_PROFILES
+from src.utils.asset_arena import AssetArena
+from src.utils.background_ingest import normalize_background, render_ready_path
+from src.utils.image_library import ImageLibrary
+from src.utils.image_search_cache import ImageSearchCache
+from src.utils.placeholder_pool import PlaceholderPool, create_placeholder_image
+from src.utils.rate_limit import CircuitBreaker, TokenBucket
 import json
 import time
-import random
-from PIL import Image, ImageDraw, ImageFilter
 
 
 class ImageService:
+    SENTENCES_PER_QUERY = 10  # Sentences served by each search query of a video
+    MAX_SEARCH_PAGES = 10
+    SEARCH_QUOTA_WINDOW = 3600  # Seconds; the Unsplash quota is per hour
+    
     def __init__(self):
-        self.unsplash_base_url = "https://api.unsplash.com"
+        self.unsplash_base_url = config.unsplash_api_url.rstrip("/")
         self.access_key = config.unsplash_access_key
+        self.search_cache = ImageSearchCache()
+        self.library = ImageLibrary()
+        self.placeholder_pool = PlaceholderPool()
+        self.api_calls = 0
+        
+        # Pooled keep-alive connections shared by searches and downloads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config.image_download_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Limits follow the services' quotas instead of fixed sleeps; the
+        # search quota is shared with earlier runs through the cache's call log
+        self.search_limiter = TokenBucket(config.unsplash_requests_per_hour / 3600,
+                                          capacity=config.unsplash_requests_per_hour)
+        self.search_limiter.spend_past(self.search_cache.recent_search_calls(self.SEARCH_QUOTA_WINDOW))
+        self.download_limiter = TokenBucket(config.image_downloads_per_second)
         
-    def search_images(self, query: str, count: int = 10) -> List[dict]:
+        # The image stage is bounded: every request has a timeout, the stage
+        # has a deadline, and Unsplash is skipped for the rest of the run
+        # after IMAGE_BREAKER_FAILURES consecutive failures
+        self.breaker = CircuitBreaker(config.image_breaker_failures)
+        self.outcomes = Counter()  # Failed and skipped requests by kind
+        self.image_sources: Dict[str, str] = {}  # Image path -> where it came from
+        self._deadline = None
+        self._outcomes_lock = threading.Lock()  # Download workers count outcomes too
+        self._stage_lock = threading.Lock()  # Library adds vs. abandoning late downloads
+        
+    def search_images(self, query: str, count: int = 10, page: int = 1) -> List[dict]:
         """
         Search for images on Unsplash based on query.
         
+        Full pages (config.unsplash_per_page results) are requested and
+        cached on disk per (query, page) for IMAGE_SEARCH_TTL_HOURS.
+        
         Args:
             query: Search query (e.g., "nature landscape", "study education")
-            count: Number of images to fetch
+            count: Number of images to return
+            page: Result page
             
         Returns:
             List of image metadata dictionaries
@@ -28,63 +75,189 @@ class ImageService:
             print("Warning: Unsplash API key not configured. Using placeholder images.")
             return self._get_placeholder_images(count)
         
-        headers = {"Authorization": f"Client-ID {self.access_key}"}
+        images = self._search_page(query, page)
+        if images is None:
+            return self._get_placeholder_images(count)
+        return images[:count]
+    
+    def _search_page(self, query: str, page: int) -> Optional[List[dict]]:
+        """One full page of search results from the cache or Unsplash (None on error)."""
+        images = self.search_cache.get(query, page)
+        if images is not None:
+            return images
         
-        # Add randomization by using page parameter
-        # Random page between 1 and 10 to get different results
-        random_page = random.randint(1, 10)
+        timeout = self._request_timeout()
+        if timeout is None:
+            return None
         
+        headers = {"Authorization": f"Client-ID {self.access_key}"}
         params = {
             "query": query,
-            "per_page": count,
-            "page": random_page,  # Add page parameter for variety
+            "per_page": config.unsplash_per_page,
+            "page": page,
             "orientation": "landscape"
         }
         
         try:
-            response = requests.get(
+            if not self.search_limiter.acquire(timeout=self._time_left()):
+                # Out of quota until after the deadline
+                self._count("skipped (deadline)")
+                return None
+            self.api_calls += 1
+            self.search_cache.record_search_call(self.SEARCH_QUOTA_WINDOW)
+            response = self.session.get(
                 f"{self.unsplash_base_url}/search/photos",
                 headers=headers,
-                params=params
+                params=params,
+                timeout=min(timeout, max(self._time_left(), 0.1))
             )
             response.raise_for_status()
             
             data = response.json()
             images = []
             
-            results = data.get("results", [])
-            # Shuffle results for more randomness
-            random.shuffle(results)
-            
-            for photo in results:
+            for photo in data.get("results", []):
                 images.append({
                     "id": photo["id"],
                     "url": photo["urls"]["regular"],
+                    "raw_url": photo["urls"].get("raw"),
                     "download_url": photo["links"]["download"],
                     "author": photo["user"]["name"],
                     "description": photo.get("description", "")
                 })
             
-            return images
-            
         except Exception as e:
             print(f"Error fetching images from Unsplash: {e}")
-            return self._get_placeholder_images(count)
+            self._record_failure(e)
+            return None
+        
+        self.breaker.succeeded()
+        self.search_cache.put(query, page, images)
+        return images
+    
+    def _time_left(self) -> float:
+        """Seconds until the image stage deadline (infinite outside the stage)."""
+        if self._deadline is None:
+            return float("inf")
+        return self._deadline - time.monotonic()
+    
+    def _request_timeout(self) -> Optional[float]:
+        """
+        Timeout for the next Unsplash request, or None if it must not be
+        made (breaker open or stage deadline passed).
+        """
+        if not self.breaker.allow():
+            self._count("skipped (breaker open)")
+            return None
+        time_left = self._time_left()
+        if time_left <= 0:
+            self._count("skipped (deadline)")
+            return None
+        return min(config.image_request_timeout, time_left)
+    
+    def _count(self, kind: str, count: int = 1):
+        """Add to the outcome counter (called from download workers too)."""
+        with self._outcomes_lock:
+            self.outcomes[kind] += count
+    
+    def _record_failure(self, error: Exception):
+        """Count a failed request and open the breaker after too many in a row."""
+        if isinstance(error, requests.Timeout):
+            kind = "timeout"
+        elif isinstance(error, requests.HTTPError) and getattr(error.response, "status_code", None) == 429:
+            kind = "throttled"
+        else:
+            kind = "error"
+        self._count(kind)
+        if self.breaker.failed():
+            print(f"⚡ Unsplash failed {self.breaker.failures} times in a row, "
+                  f"using cached and placeholder images for the rest of the run")
+    
+    @staticmethod
+    def _rendition_url(image_data: dict) -> str:
+        """
+        URL of an uncropped rendition, scaled via Unsplash's image URL
+        parameters to the height of the tallest layout. Every layout then
+        crops its frame from it without upscaling (a Shorts frame is as
+        tall as the whole landscape photo). Falls back to the 'regular'
+        size for results cached before raw URLs were kept.
+        """
+        raw_url = image_data.get("raw_url")
+        if not raw_url:
+            return image_data["url"]
+        height = max(layout.height for layout in LAYOUT_PROFILES.values())
+        separator = "&" if "?" in raw_url else "?"
+        return f"{raw_url}{separator}h={height}&fit=max&fm=jpg&q=85"
+    
+    def _unused_images(self, query: str) -> Iterator[dict]:
+        """
+        Yield search results for a query that were not used recently,
+        page by page; the next page is only requested once one runs out.
+        """
+        for page in range(1, self.MAX_SEARCH_PAGES + 1):
+            images = self._search_page(query, page)
+            if not images:
+                return
+            for image in images:
+                if not self.search_cache.is_used(image["id"]):
+                    yield image
+            if len(images) < config.unsplash_per_page:
+                return  # Last page
     
-    def download_image(self, image_url: str, save_path: str) -> str:
-        """Download image from URL and save to local path."""
+    def download_image(self, image_url: str, save_path: str,
+                       abandoned: Optional[threading.Event] = None) -> str:
+        """
+        Download image from URL and save to local path.
+        
+        The response is streamed into a temporary file next to save_path
+        and renamed into place, so a failed download leaves nothing behind.
+        A transfer still running after the request timeout is dropped at
+        its next chunk; the stage deadline bounds anything slower.
+        
+        Args:
+            image_url: URL to download
+            save_path: Where to save the image
+            abandoned: Set once the caller no longer waits for the result;
+                the download then stops and writes nothing
+        """
+        timeout = self._request_timeout()
+        if timeout is None:
+            return None
+        
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(save_path) or ".", suffix=".tmp")
+        os.close(fd)
         try:
-            response = requests.get(image_url, stream=True)
-            response.raise_for_status()
-            
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            if not self.download_limiter.acquire(timeout=self._time_left()):
+                self._count("skipped (deadline)")
+                os.remove(tmp_path)
+                return None
+            started = time.monotonic()
+            with self.session.get(image_url, stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+                
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        if abandoned is not None and abandoned.is_set():
+                            break
+                        # The read timeout applies per read; bound the transfer too
+                        if time.monotonic() - started > timeout:
+                            raise requests.Timeout(f"Download took longer than {timeout:.0f}s")
+                        f.write(chunk)
             
+            if abandoned is not None and abandoned.is_set():
+                os.remove(tmp_path)
+                return None
+            os.replace(tmp_path, save_path)
+            self.breaker.succeeded()
             return save_path
             
         except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if abandoned is not None and abandoned.is_set():
+                return None  # Nobody waits for it; don't count it against this or the next stage
             print(f"Error downloading image: {e}")
+            self._record_failure(e)
             return None
     
     def get_images_for_sentences(self, sentences: List[tuple], 
@@ -98,13 +271,22 @@ class ImageService:
             
         Returns:
             List of local image paths
+            
+        The stage finishes within IMAGE_STAGE_TIMEOUT seconds: backgrounds
+        that are not downloaded by then, or once the Unsplash circuit
+        breaker has opened, are served from the library (even if used
+        recently) or as placeholders. Where each image came from is kept
+        in image_sources.
         """
-        image_paths = []
+        started = time.monotonic()
+        self._deadline = started + config.image_stage_timeout
+        with self._outcomes_lock:
+            self.outcomes.clear()
         
-        # Clean up old images (older than 7 days)
-        self._cleanup_old_images(days=7)
+        # Drop derived data that has aged out
+        self._cleanup_caches(days=7)
         
-        # Add timestamp to filename to avoid reusing old images
+        # Add timestamp to placeholder filenames
         timestamp = int(time.time())
         
         # Add variety to search queries based on theme
@@ -124,39 +306,148 @@ class ImageService:
         }
         
         # Get variations for the theme
-        queries = theme_variations.get(theme, [f"{theme} landscape"] * 10)
+        queries = theme_variations.get(theme, [f"{theme} landscape"])
+        
+        # A few queries per video, rotating daily; sentences take turns
+        # drawing unused photos from their (cached, full-page) results
+        query_count = min(len(queries), math.ceil(len(sentences) / self.SENTENCES_PER_QUERY))
+        first = date.today().toordinal() % len(queries)
+        streams = [(query, self._unused_images(query))
+                   for query in (queries[(first + k) % len(queries)] for k in range(query_count))]
+        if not self.access_key:
+            print("Warning: Unsplash API key not configured. Using placeholder images.")
+            streams = []
         
-        # Use different query for each image
+        # Local library first: rested images of the theme that don't resemble
+        # anything shown within the reuse window. The rest comes from search.
+        image_paths = [None] * len(sentences)
+        origins = [None] * len(sentences)
+        selected = {}
+        avoid_hashes = self.library.recent_hashes()
+        recent_count = len(avoid_hashes)
         for i in range(len(sentences)):
-            query = queries[i % len(queries)]
-            # Get multiple images and pick a random one
-            images = self.search_images(query, 10)
-            
-            filename = f"background_{timestamp}_{i}.jpg"
-            save_path = os.path.join(config.image_output_dir, filename)
-            
-            if images and len(images) > 0:
-                # Pick a random image from the results
-                image_data = random.choice(images)
-                # Download image
-                if image_data.get("url"):
-                    downloaded_path = self.download_image(image_data["url"], save_path)
-                    if downloaded_path:
-                        image_paths.append(downloaded_path)
-                    else:
-                        # Use placeholder if download fails
-                        image_paths.append(self._create_placeholder_image(save_path))
-                else:
-                    image_paths.append(self._create_placeholder_image(save_path))
+            local_path = self.library.pick(theme, avoid_hashes)
+            if local_path is None and self._time_left() > 0:
+                for k in range(len(streams)):
+                    query, stream = streams[(i + k) % len(streams)]
+                    image_data = next(stream, None)
+                    if image_data:
+                        # Never hand the same photo out again within the reuse window
+                        self.search_cache.mark_used(image_data["id"])
+                        local_path = self.library.find_source(image_data["id"])
+                        if local_path is None:
+                            selected[i] = (query, image_data)
+                        break
+            if local_path:
+                image_paths[i] = local_path
+                avoid_hashes.append(self.library.mark_used(local_path)["phash"])
+                origins[i] = "library"
+        self.search_cache.save()
+        if streams:
+            print(f"🔎 Unsplash search: {self.api_calls} API calls, "
+                  f"{self.search_cache.hits} cached pages")
+        
+        # Set at the deadline: downloads still running stop writing files
+        # and adding to the library (their results would not be used)
+        abandoned = threading.Event()
+        
+        def discard(path: str):
+            for leftover in (path, render_ready_path(path, config.video_width, config.video_height)):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+        
+        def fetch(i: int) -> Optional[str]:
+            if abandoned.is_set():
+                return None
+            query, image_data = selected[i]
+            save_path = os.path.join(config.image_output_dir, f"background_{image_data['id']}.jpg")
+            downloaded_path = self.download_image(self._rendition_url(image_data), save_path, abandoned)
+            if not downloaded_path:
+                return None
+            if abandoned.is_set():
+                discard(downloaded_path)
+                return None
+            if not self._ingest(downloaded_path):
+                return None
+            with self._stage_lock:
+                if abandoned.is_set():
+                    discard(downloaded_path)
+                    return None
+                self.library.add(downloaded_path, theme, query, image_data["id"])
+            return downloaded_path
+        
+        # Downloads run concurrently (rate limited); requests are time-bounded,
+        # and any still running at the deadline are abandoned
+        executor = ThreadPoolExecutor(max_workers=config.image_download_workers)
+        futures = {executor.submit(fetch, i): i for i, (_, image_data) in selected.items()
+                   if image_data.get("url")}
+        done, late = wait(futures, timeout=max(0.0, self._time_left()))
+        with self._stage_lock:
+            abandoned.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        for future in done:
+            path = future.result()
+            if path:
+                i = futures[future]
+                image_paths[i] = path
+                avoid_hashes.append(self.library.mark_used(path)["phash"])
+                origins[i] = "downloaded"
+        if late:
+            self._count("abandoned (deadline)", len(late))
+        
+        # The rest: when Unsplash is out for this run, any library image of
+        # the theme not yet in this video; otherwise (or if none) a placeholder
+        upstream_down = self.breaker.is_open or self._time_left() <= 0
+        video_hashes = avoid_hashes[recent_count:]
+        for i, path in enumerate(image_paths):
+            if path:
+                continue
+            path = self.library.pick(theme, video_hashes, rested=False) if upstream_down else None
+            if path:
+                origins[i] = "cached"
             else:
-                # No images found, use placeholder
-                image_paths.append(self._create_placeholder_image(save_path))
-            
-            # Rate limiting
-            time.sleep(0.5)
+                path = self._create_placeholder_image(
+                    os.path.join(config.image_output_dir, f"background_{timestamp}_{i}.jpg"), theme)
+                self.library.add(path)
+                origins[i] = "placeholder"
+            image_paths[i] = path
+            video_hashes.append(self.library.mark_used(path)["phash"])
+        
+        self.image_sources.update(zip(image_paths, origins))
+        self._report(Counter(origins), time.monotonic() - started)
+        
+        # Keep the library within its size budget
+        self.library.evict(keep=image_paths)
+        self.library.save()
         
         return image_paths
     
+    def _report(self, origins: Counter, seconds: float):
+        """Print where the backgrounds came from and what went wrong upstream."""
+        print(f"📚 Backgrounds in {seconds:.1f}s: "
+              + ", ".join(f"{origins[origin]} {origin}"
+                          for origin in ("library", "downloaded", "cached", "placeholder")
+                          if origins[origin]))
+        with self._outcomes_lock:
+            outcomes = dict(self.outcomes)
+        if outcomes:
+            print(f"⚠️ Unsplash requests: " + ", ".join(f"{count} {kind}"
+                                                     for kind, count in outcomes.items())
+                  + (" (circuit breaker open)" if self.breaker.is_open else ""))
+    
+    @staticmethod
+    def _ingest(image_path: str) -> bool:
+        """
+        Store the render-ready frame of a fetched background, so rendering
+        never decodes or resizes it. Returns False for unreadable images.
+        """
+        try:
+            normalize_background(image_path, config.video_width, config.video_height)
+            return True
+        except Exception as e:
+            print(f"Error preparing image {os.path.basename(image_path)}: {e}")
+            return False
+    
     def _get_placeholder_images(self, count: int) -> List[dict]:
         """Generate placeholder image data when API is not available."""
         images = []
@@ -170,87 +461,22 @@ class ImageService:
             })
         return images
     
-    def _cleanup_old_images(self, days: int = 7):
-        """Remove images older than specified days."""
+    def _cleanup_caches(self, days: int = 7):
+        """Remove decoded backgrounds and search results older than specified days."""
         try:
-            current_time = time.time()
-            cutoff_time = current_time - (days * 24 * 60 * 60)
-            
-            for filename in os.listdir(config.image_output_dir):
-                if filename.startswith("background_") and filename.endswith(".jpg"):
-                    file_path = os.path.join(config.image_output_dir, filename)
-                    if os.path.getmtime(file_path) < cutoff_time:
-                        os.remove(file_path)
+            AssetArena().cleanup(days)
+            self.search_cache.cleanup()
         except Exception as e:
             # Don't fail if cleanup fails
             pass
     
-    def _create_placeholder_image(self, save_path: str) -> str:
-        """Create a more sophisticated placeholder image using Pillow."""
-        from PIL import Image, ImageDraw, ImageFilter
-        import random
-        
-        width, height = config.video_width, config.video_height
-        img = Image.new('RGB', (width, height))
-        draw = ImageDraw.Draw(img)
-        
-        # Create a more interesting gradient with multiple colors
-        gradient_styles = [
-            # Sunset style
-            [(255, 94, 77), (255, 154, 0), (237, 117, 57), (95, 39, 205)],
-            # Ocean style
-            [(69, 104, 220), (89, 173, 246), (146, 232, 192), (255, 255, 255)],
-            # Forest style
-            [(34, 139, 34), (60, 179, 113), (152, 251, 152), (255, 250, 205)],
-            # Purple dream
-            [(138, 43, 226), (218, 112, 214), (255, 182, 193), (255, 228, 225)]
-        ]
-        
-        colors = random.choice(gradient_styles)
-        
-        # Create smooth gradient
-        for y in range(height):
-            # Calculate which color segment we're in
-            segment = y / height * (len(colors) - 1)
-            idx = int(segment)
-            
-            if idx < len(colors) - 1:
-                # Interpolate between colors
-                t = segment - idx
-                r = int(colors[idx][0] * (1 - t) + colors[idx + 1][0] * t)
-                g = int(colors[idx][1] * (1 - t) + colors[idx + 1][1] * t)
-                b = int(colors[idx][2] * (1 - t) + colors[idx + 1][2] * t)
-            else:
-                r, g, b = colors[-1]
-            
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
-        
-        # Add some geometric shapes for visual interest
-        for _ in range(random.randint(3, 7)):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            size = random.randint(100, 400)
-            opacity = random.randint(20, 60)
-            
-            # Create a semi-transparent overlay
-            overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
-            
-            shape_color = (255, 255, 255, opacity)
-            if random.choice([True, False]):
-                # Draw circle
-                overlay_draw.ellipse([x - size, y - size, x + size, y + size], 
-                                   fill=shape_color)
-            else:
-                # Draw rectangle
-                overlay_draw.rectangle([x - size//2, y - size//2, x + size//2, y + size//2],
-                                     fill=shape_color)
-            
-            # Apply blur to the overlay
-            overlay = overlay.filter(ImageFilter.GaussianBlur(radius=50))
-            
-            # Composite onto main image
-            img = Image.alpha_composite(img.convert('RGBA'), overlay).convert('RGB')
-        
-        img.save(save_path)
-        return save_path
\ No newline at end of file
+    def _create_placeholder_image(self, save_path: str, theme: Optional[str] = None) -> str:
+        """
+        Place a placeholder background at save_path, taken from the
+        pre-generated pool (with its render-ready frame) or drawn now.
+        """
+        if self.placeholder_pool.take(theme, save_path):
+            return save_path
+        create_placeholder_image(save_path, theme)
+        self._ingest(save_path)
+        return save_path
@@ -3,6 +3,8 @@ import requests
 from typing import Optional
 from pydub import AudioSegment
 from src.core.config import config
+from src.utils.audio_index import audio_index
+from src.utils.pcm_cache import ensure_pcm
 
 
 class MusicService:
@@ -32,9 +34,9 @@ class MusicService:
         
         # Otherwise, try to download from free sources
         music_urls = {
-            "calm": "https://www.bensound.com/bensound-music/bensound-memories.mp3",
-            "upbeat": "https://www.bensound.com/bensound-music/bensound-sunny.mp3",
-            "inspiring": "https://www.bensound.com/bensound-music/bensound-inspire.mp3"
+            "calm": f"{config.bensound_url}/bensound-music/bensound-memories.mp3",
+            "upbeat": f"{config.bensound_url}/bensound-music/bensound-sunny.mp3",
+            "inspiring": f"{config.bensound_url}/bensound-music/bensound-inspire.mp3"
         }
         
         if style in music_urls:
@@ -93,6 +95,10 @@ class MusicService:
         audio = audio - (20 * (1 - config.music_volume))  # Convert to dB
         
         audio.export(output_path, format="mp3")
+        # Decode once now so mixing reads samples directly
+        ensure_pcm(output_path)
+        audio_index.record(output_path)
+        audio_index.save()
         return output_path
     
     def _generate_silence(self, duration: int) -> str:
@@ -100,6 +106,7 @@ class MusicService:
         silence = AudioSegment.silent(duration=duration * 1000)
         output_path = os.path.join(self.music_dir, "silence.mp3")
         silence.export(output_path, format="mp3")
+        ensure_pcm(output_path)
         return output_path
     
     def create_music_library(self):
@@ -1,18 +1,105 @@
+import io
 import os
+import time
+import wave
+import queue
+import random
+import tempfile
+import threading
+from xml.sax.saxutils import escape
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import numpy as np
+import requests
 import azure.cognitiveservices.speech as speechsdk
 from gtts import gTTS
+from gtts.tts import gTTSError
 from src.core.config import config
+from src.utils.audio_index import audio_index
+from src.utils.pcm_cache import CHANNELS, SAMPLE_RATE, decode_audio, ensure_pcm, register_pcm, registered_pcm, release_pcm, save_pcm, write_wav
+from src.utils.rate_limit import AdaptiveLimiter, LatencyTracker
+from src.utils.tts_cache import TTSCache
+from src.utils.word_timings import (save_word_timings, clear_word_timings, load_word_timings,
+                                    register_word_timings, release_word_timings, word_timings_path)
+
+
+class TTSThrottledError(Exception):
+    """Raised by an engine when the TTS service rejects a request as throttled."""
 
 
 class TTSEngine(ABC):
+    name = "base"
+    supports_batch = False  # Whether generate_batch saves requests
+    
     @abstractmethod
     def generate_audio(self, text: str, language: str, output_path: str) -> str:
         pass
+    
+    def synthesize(self, text: str, language: str) -> Tuple[np.ndarray, List[dict]]:
+        """
+        Synthesize one utterance in memory.
+        
+        Returns:
+            Canonical PCM samples (see pcm_cache) and word timings. Engines
+            that can only write files go through a temporary file.
+        """
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self.generate_audio(text, language, path)
+            with open(path, 'rb') as f:
+                samples = decode_audio(f.read())
+            return samples, load_word_timings(path) or []
+        finally:
+            for leftover in (path, word_timings_path(path)):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+    
+    def generate_batch(self, texts: List[str], language: str, output_paths: List[str]) -> List[str]:
+        """Synthesize several utterances of one language into their own files."""
+        return [self.generate_audio(text, language, path)
+                for text, path in zip(texts, output_paths)]
+    
+    def voice_settings(self, language: str) -> Tuple[str, float]:
+        """Voice and speed used for a language (part of the TTS cache key)."""
+        return language, 1.0
+
+
+class _PooledSynthesizer:
+    """A long-lived synthesizer with an open connection and its word boundary buffer."""
+    
+    def __init__(self, speech_config: speechsdk.SpeechConfig):
+        # audio_config=None keeps the audio in the result; we write the file ourselves
+        self.synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+        self.words = []
+        self.bookmarks = {}
+        self.synthesizer.synthesis_word_boundary.connect(self._on_word_boundary)
+        self.synthesizer.bookmark_reached.connect(self._on_bookmark)
+        
+        # Open the connection now so the first request doesn't pay the handshake
+        self.connection = speechsdk.Connection.from_speech_synthesizer(self.synthesizer)
+        self.connection.open(True)
+    
+    def _on_word_boundary(self, evt):
+        if evt.boundary_type == speechsdk.SpeechSynthesisBoundaryType.Word:
+            start = evt.audio_offset / 10_000_000  # 100ns ticks
+            self.words.append({
+                "word": evt.text,
+                "start": start,
+                "end": start + evt.duration.total_seconds()
+            })
+    
+    def _on_bookmark(self, evt):
+        self.bookmarks[evt.text] = evt.audio_offset / 10_000_000
 
 
 class AzureTTS(TTSEngine):
+    name = "azure"
+    supports_batch = True
+    MAX_BATCH_SENTENCES = 40  # Keeps one request well under the service's audio length limit
+    
     def __init__(self):
         if not config.azure_speech_key or not config.azure_speech_region:
             raise ValueError("Azure Speech credentials not configured")
@@ -21,49 +108,320 @@ class AzureTTS(TTSEngine):
             subscription=config.azure_speech_key,
             region=config.azure_speech_region
         )
-        
-    def generate_audio(self, text: str, language: str, output_path: str) -> str:
-        voice_name = config.tts_voice_en if language == "en" else config.tts_voice_ko
-        self.speech_config.speech_synthesis_voice_name = voice_name
-        
-        audio_config = speechsdk.audio.AudioOutputConfig(filename=output_path)
-        synthesizer = speechsdk.SpeechSynthesizer(
-            speech_config=self.speech_config,
-            audio_config=audio_config
+        self.speech_config.set_speech_synthesis_output_format(
+            # The mixers' sample rate, so results are used without resampling
+            speechsdk.SpeechSynthesisOutputFormat.Riff44100Hz16BitMonoPcm
         )
+        # A request that stalls this long is canceled instead of holding its synthesizer
+        self.speech_config.set_property(
+            speechsdk.PropertyId.SpeechSynthesis_FrameTimeoutInterval,
+            str(int(config.tts_request_timeout * 1000))
+        )
+        
+        # Synthesizers are leased to one caller at a time, one pool per voice
+        self._pools: Dict[str, queue.Queue] = {}
+        self._pools_lock = threading.Lock()
+        for voice_name in (config.tts_voice_en, config.tts_voice_ko):
+            self._get_pool(voice_name)
         
-        ssml = f"""
+    def voice_settings(self, language: str) -> Tuple[str, float]:
+        voice_name = config.tts_voice_en if language == "en" else config.tts_voice_ko
+        return voice_name, config.tts_speed
+    
+    def _get_pool(self, voice_name: str) -> queue.Queue:
+        """Return the synthesizer pool of a voice, opening it on first use."""
+        with self._pools_lock:
+            if voice_name not in self._pools:
+                pool = queue.Queue()
+                for _ in range(max(1, config.azure_synthesizer_pool_size)):
+                    pool.put(_PooledSynthesizer(self.speech_config))
+                self._pools[voice_name] = pool
+            return self._pools[voice_name]
+    
+    def _build_ssml(self, body: str, language: str) -> str:
+        """Wrap SSML body markup in the voice and prosody of a language."""
+        voice_name = config.tts_voice_en if language == "en" else config.tts_voice_ko
+        return f"""
         <speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{language}">
             <voice name="{voice_name}">
                 <prosody rate="{config.tts_speed}">
-                    {text}
+                    {body}
                 </prosody>
             </voice>
         </speak>
         """
+    
+    def _speak(self, ssml: str, language: str) -> Tuple[bytes, list, dict]:
+        """Synthesize SSML on a pooled synthesizer; returns audio, words and bookmarks."""
+        voice_name = config.tts_voice_en if language == "en" else config.tts_voice_ko
+        pool = self._get_pool(voice_name)
+        pooled = pool.get()
+        try:
+            # Keep word boundaries so the video can highlight words in sync
+            pooled.words = []
+            pooled.bookmarks = {}
+            result = pooled.synthesizer.speak_ssml_async(ssml).get()
+            words, bookmarks = pooled.words, pooled.bookmarks
+        finally:
+            pool.put(pooled)
+        
+        self._check_result(result)
+        return result.audio_data, words, bookmarks
+    
+    def generate_audio(self, text: str, language: str, output_path: str) -> str:
+        audio_data, words, _ = self._speak(self._build_ssml(escape(text), language), language)
+        
+        with open(output_path, 'wb') as f:
+            f.write(audio_data)
+        save_word_timings(output_path, words)
+        return output_path
+    
+    def synthesize(self, text: str, language: str) -> Tuple[np.ndarray, List[dict]]:
+        # result.audio_data already holds the whole stream in memory
+        audio_data, words, _ = self._speak(self._build_ssml(escape(text), language), language)
+        return decode_audio(audio_data), words
+    
+    def generate_batch(self, texts: List[str], language: str, output_paths: List[str]) -> List[str]:
+        """
+        Synthesize many sentences per request and split the audio at bookmarks.
         
-        result = synthesizer.speak_ssml_async(ssml).get()
+        Each sentence is preceded by a <bookmark>; the offsets reported for
+        them mark where one sentence's clip ends and the next one starts.
+        """
+        for start in range(0, len(texts), self.MAX_BATCH_SENTENCES):
+            self._generate_bookmarked(texts[start:start + self.MAX_BATCH_SENTENCES], language,
+                                      output_paths[start:start + self.MAX_BATCH_SENTENCES])
+        return output_paths
+    
+    def _generate_bookmarked(self, texts: List[str], language: str, output_paths: List[str]):
+        """Synthesize one batch request and write per-sentence clips."""
+        body = "".join(f'<bookmark mark="s{i}"/><s>{escape(text)}</s>'
+                       for i, text in enumerate(texts))
+        body += '<bookmark mark="end"/>'
+        audio_data, words, bookmarks = self._speak(self._build_ssml(body, language), language)
+        
+        with wave.open(io.BytesIO(audio_data), 'rb') as wav:
+            params = wav.getparams()
+            frames = wav.readframes(wav.getnframes())
+        frame_size = params.sampwidth * params.nchannels
+        total = len(frames) / frame_size / params.framerate
         
+        missing = [f"s{i}" for i in range(len(texts)) if f"s{i}" not in bookmarks]
+        if missing:
+            raise Exception(f"Batch synthesis did not report bookmarks: {', '.join(missing)}")
+        offsets = [bookmarks[f"s{i}"] for i in range(len(texts))] + [bookmarks.get("end", total)]
+        
+        for i, output_path in enumerate(output_paths):
+            start, end = offsets[i], offsets[i + 1]
+            first = round(start * params.framerate) * frame_size
+            last = round(end * params.framerate) * frame_size
+            
+            with wave.open(output_path, 'wb') as clip:
+                clip.setnchannels(params.nchannels)
+                clip.setsampwidth(params.sampwidth)
+                clip.setframerate(params.framerate)
+                clip.writeframes(frames[first:last])
+            
+            save_word_timings(output_path, [
+                {"word": w["word"], "start": round(w["start"] - start, 4),
+                 "end": round(w["end"] - start, 4)}
+                for w in words if start <= w["start"] < end
+            ])
+    
+    @staticmethod
+    def _check_result(result):
+        """Raise for a synthesis result that didn't complete."""
         if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-            return output_path
-        else:
-            raise Exception(f"Speech synthesis failed: {result.reason}")
+            return
+        
+        if result.reason == speechsdk.ResultReason.Canceled:
+            details = result.cancellation_details
+            if details.error_code == speechsdk.CancellationErrorCode.TooManyRequests:
+                raise TTSThrottledError(f"Azure throttled synthesis: {details.error_details}")
+            raise Exception(f"Speech synthesis canceled: {details.error_details}")
+        raise Exception(f"Speech synthesis failed: {result.reason}")
+
+
+class AzureRestTTS(AzureTTS):
+    """
+    Azure Speech over the REST API instead of the SDK: one HTTP request
+    per utterance, without word boundaries or bookmarks. AZURE_TTS_ENDPOINT
+    points it at another host (e.g. standin_server.py).
+    """
+    name = "azure_rest"
+    supports_batch = False  # Batches are split at bookmarks, which REST doesn't report
+    
+    def __init__(self):
+        if not config.azure_speech_key or not (config.azure_tts_endpoint or config.azure_speech_region):
+            raise ValueError("Azure Speech credentials not configured")
+        
+        endpoint = (config.azure_tts_endpoint
+                    or f"https://{config.azure_speech_region}.tts.speech.microsoft.com")
+        self.url = endpoint.rstrip("/") + "/cognitiveservices/v1"
+        self.session = requests.Session()
+    
+    def _speak(self, ssml: str, language: str) -> Tuple[bytes, list, dict]:
+        response = self.session.post(self.url, data=ssml.encode('utf-8'), headers={
+            "Ocp-Apim-Subscription-Key": config.azure_speech_key,
+            "Content-Type": "application/ssml+xml",
+            # The mixers' sample rate, so results are used without resampling
+            "X-Microsoft-OutputFormat": "riff-44100hz-16bit-mono-pcm",
+            "User-Agent": "mecaspace"
+        }, timeout=config.tts_request_timeout)
+        if response.status_code == 429:
+            raise TTSThrottledError(f"Azure throttled synthesis: {response.text[:200]}")
+        response.raise_for_status()
+        return response.content, [], {}
+
+
+class _RedirectedGTTS(gTTS):
+    """gTTS sending its requests to GTTS_URL instead of Google Translate."""
+    
+    def _prepare_requests(self):
+        prepared = super()._prepare_requests()
+        for request in prepared:
+            request.url = config.gtts_url.rstrip("/") + urlsplit(request.url).path
+        return prepared
 
 
 class GoogleTTS(TTSEngine):
+    name = "gtts"
+    
     def generate_audio(self, text: str, language: str, output_path: str) -> str:
+        self._request(text, language, lambda tts: tts.save(output_path))
+        # gTTS reports no word boundaries
+        clear_word_timings(output_path)
+        return output_path
+    
+    def synthesize(self, text: str, language: str) -> Tuple[np.ndarray, List[dict]]:
+        buffer = io.BytesIO()
+        self._request(text, language, lambda tts: tts.write_to_fp(buffer))
+        return decode_audio(buffer.getvalue()), []
+    
+    @staticmethod
+    def _request(text: str, language: str, write):
+        """Run a gTTS request, reporting rate limiting as throttling."""
         lang_code = "en" if language == "en" else "ko"
-        tts = gTTS(text=text, lang=lang_code, slow=False)
-        tts.save(output_path)
+        tts = (_RedirectedGTTS if config.gtts_url else gTTS)(text=text, lang=lang_code, slow=False,
+                                                             timeout=config.tts_request_timeout)
+        try:
+            write(tts)
+        except gTTSError as e:
+            if e.rsp is not None and e.rsp.status_code == 429:
+                raise TTSThrottledError(str(e)) from e
+            raise
+
+
+class LocalTTS(TTSEngine):
+    """
+    Offline engine for benchmarks and network-free runs.
+    
+    Speech is a tone whose length follows the text length, with evenly
+    spread word timings, so output is deterministic for a given text.
+    A simulated request latency (TTS_LOCAL_LATENCY plus up to
+    TTS_LOCAL_LATENCY_JITTER, fixed per text) stands in for the service.
+    """
+    name = "local"
+    SECONDS_PER_CHAR = 0.06
+    PADDING = 0.2  # Lead-in and tail around the words
+    FREQUENCIES = {"en": 220.0, "ko": 330.0}
+    
+    def __init__(self, latency: Optional[float] = None, jitter: Optional[float] = None):
+        self.latency = config.tts_local_latency if latency is None else latency
+        self.jitter = config.tts_local_latency_jitter if jitter is None else jitter
+    
+    def voice_settings(self, language: str) -> Tuple[str, float]:
+        return f"tone-{self.FREQUENCIES.get(language, 220.0):.0f}", config.tts_speed
+    
+    def generate_audio(self, text: str, language: str, output_path: str) -> str:
+        samples, words = self.synthesize(text, language)
+        write_wav(output_path, samples)
+        save_word_timings(output_path, words)
         return output_path
+    
+    def synthesize(self, text: str, language: str) -> Tuple[np.ndarray, List[dict]]:
+        delay = self.latency + random.Random(f"{language}:{text}").uniform(0, self.jitter)
+        if delay > config.tts_request_timeout:
+            # Like a service request, a simulated one gives up at the timeout
+            time.sleep(config.tts_request_timeout)
+            raise TimeoutError(f"Local TTS request timed out after {config.tts_request_timeout}s")
+        if delay > 0:
+            time.sleep(delay)
+        
+        speed = config.tts_speed or 1.0
+        seconds_per_char = self.SECONDS_PER_CHAR / speed
+        duration = 2 * self.PADDING + seconds_per_char * len(text)
+        
+        t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+        envelope = np.minimum(1.0, np.minimum(t, duration - t) * 20)
+        tone = 0.3 * envelope * np.sin(2 * np.pi * self.FREQUENCIES.get(language, 220.0) * t)
+        samples = np.repeat(tone.astype(np.float32)[:, None], CHANNELS, axis=1)
+        
+        words = []
+        position = self.PADDING
+        for word in text.split():
+            words.append({"word": word, "start": round(position, 4),
+                          "end": round(position + len(word) * seconds_per_char, 4)})
+            position += (len(word) + 1) * seconds_per_char
+        
+        return samples, words
+
+
+ENGINES = {
+    "azure": AzureTTS,
+    "azure_rest": AzureRestTTS,
+    "gtts": GoogleTTS,
+    "local": LocalTTS,
+}
+
+
+def create_engine(name: str) -> TTSEngine:
+    """Create a TTS engine by its config name (unknown names use gTTS)."""
+    return ENGINES.get(name, GoogleTTS)()
 
 
 class TTSService:
-    def __init__(self):
-        if config.tts_engine == "azure":
-            self.engine = AzureTTS()
+    MIN_AUDIO_SECONDS = 0.1  # Shorter or silent results are not accepted
+    
+    def __init__(self, engine: Optional[TTSEngine] = None,
+                 hedge_engine: Optional[TTSEngine] = None):
+        """
+        Args:
+            engine: Engine for all languages (e.g. a stub engine for
+                reproducible test renders); by default one per language
+                from config
+            hedge_engine: Engine asked when the primary engine is slow or
+                failing; by default TTS_HEDGE_ENGINE unless engine is given
+        """
+        if engine is not None:
+            self.engines = {"en": engine, "ko": engine}
         else:
-            self.engine = GoogleTTS()
+            created = {}
+            self.engines = {}
+            for language, name in (("en", config.tts_engine_en), ("ko", config.tts_engine_ko)):
+                if name not in created:
+                    created[name] = create_engine(name)
+                self.engines[language] = created[name]
+            if config.tts_hedge_engine:
+                hedge_engine = created.get(config.tts_hedge_engine) or \
+                    create_engine(config.tts_hedge_engine)
+        
+        # Hedging: past a percentile of the primary engine's recent latency,
+        # the hedge engine is asked too and the first acceptable result wins
+        self.hedge_engine = hedge_engine
+        self.latency = {language: LatencyTracker(config.tts_hedge_percentile, config.tts_hedge_delay)
+                        for language in self.engines}
+        self._hedge_pool = ThreadPoolExecutor(max_workers=2 * config.tts_max_in_flight) \
+            if hedge_engine else None
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self._stats_lock = threading.Lock()
+        
+        # Engine that produced each audio file (audio path -> engine name)
+        self.served_by: Dict[str, str] = {}
+        
+        # Recurring sentences are served from disk instead of the TTS service
+        self.cache = TTSCache() if config.tts_cache_enabled else None
     
     def generate_sentence_audio(self, sentences: List[Tuple[str, str]], 
                               output_dir: str) -> List[Tuple[str, str]]:
@@ -75,17 +433,249 @@ class TTSService:
             output_dir: Directory to save audio files
             
         Returns:
-            List of (english_audio_path, korean_audio_path) tuples
+            List of (english_audio_path, korean_audio_path) tuples. With the
+            TTS cache enabled these point into the cache directory. Audio
+            synthesized in this run is also kept in memory (see pcm_cache),
+            so with the cache and TTS_WRITE_AUDIO off no file is written.
         """
-        audio_files = []
-        
+        jobs = []
         for i, (en_text, ko_text) in enumerate(sentences):
-            en_audio_path = os.path.join(output_dir, f"sentence_{i}_en.wav")
-            ko_audio_path = os.path.join(output_dir, f"sentence_{i}_ko.wav")
+            jobs.append((en_text, "en", os.path.join(output_dir, f"sentence_{i}_en.wav")))
+            jobs.append((ko_text, "ko", os.path.join(output_dir, f"sentence_{i}_ko.wav")))
+        
+        limiter = AdaptiveLimiter(config.tts_max_in_flight)
+        if config.tts_batch_ssml and all(e.supports_batch for e in self.engines.values()):
+            paths = self._synthesize_batched(limiter, jobs)
+        else:
+            # Utterances are synthesized concurrently; map() keeps sentence order
+            with ThreadPoolExecutor(max_workers=limiter.max_in_flight) as executor:
+                paths = list(executor.map(lambda job: self._synthesize_with_retry(limiter, *job),
+                                          jobs))
+        
+        # Decode every clip once to canonical PCM for the mixers and index
+        # its duration and loudness for planning
+        def prepare(path: str):
+            if registered_pcm(path) is None:
+                ensure_pcm(path)
+            audio_index.record(path)
+        
+        with ThreadPoolExecutor(max_workers=limiter.max_in_flight) as executor:
+            list(executor.map(prepare, set(paths)))
+        audio_index.save()
+        
+        audio_files = list(zip(paths[0::2], paths[1::2]))
+        
+        if self.cache:
+            print(f"💾 TTS cache: {self.cache.hits} hits, {self.cache.misses} misses")
+        if self.hedges_fired:
+            print(f"🔀 TTS hedging: {self.hedges_fired} slow or failed requests hedged, "
+                  f"{self.hedges_won} served by {self.hedge_engine.name}")
+        
+        return audio_files
+    
+    @staticmethod
+    def release_audio(audio_files: List[Tuple[str, str]]):
+        """
+        Drop the in-memory samples and word timings of generated audio once
+        every mix that needs them is done. Files on disk are not touched.
+        """
+        for pair in audio_files:
+            for path in pair:
+                release_pcm(path)
+                release_word_timings(path)
+    
+    def close(self):
+        """
+        Stop the hedge pool. A request still running there (a hedge race's
+        loser) is not waited for; the engine timeout bounds it.
+        """
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _synthesize_batched(self, limiter: AdaptiveLimiter, jobs: List[tuple]) -> List[str]:
+        """
+        Synthesize all uncached utterances of each language in one batch
+        request (see TTSEngine.generate_batch), in parallel for both languages.
+        """
+        paths = [None] * len(jobs)
+        batches = {}
+        for index, (text, language, output_path) in enumerate(jobs):
+            key = None
+            if self.cache:
+                key = self._cache_key(text, language)
+                paths[index] = self.cache.lookup(key)
+                if paths[index]:
+                    self.served_by[paths[index]] = self.engines[language].name
+                    continue
+                output_path = self.cache.temp_path(key)
+            
+            batch = batches.setdefault(language, {})
+            # Repeated sentences are synthesized once
+            batch.setdefault(key or output_path, (text, output_path, key, []))[3].append(index)
+        
+        def run_batch(language: str, batch: dict):
+            entries = list(batch.values())
+            engine = self.engines[language]
+            try:
+                self._call_with_retry(limiter, f"{len(entries)} {language} sentences",
+                                      lambda: engine.generate_batch(
+                                          [text for text, _, _, _ in entries], language,
+                                          [path for _, path, _, _ in entries]))
+                for text, path, key, indices in entries:
+                    if key:
+                        path = self.cache.store(key, path)
+                    self.served_by[path] = engine.name
+                    for index in indices:
+                        paths[index] = path
+            finally:
+                # Stored entries were moved into the cache; drop what a failed batch left
+                for _, path, key, _ in entries:
+                    if key:
+                        self.cache.discard(path)
+        
+        with ThreadPoolExecutor(max_workers=max(1, len(batches))) as executor:
+            for future in [executor.submit(run_batch, language, batch)
+                           for language, batch in batches.items()]:
+                future.result()
+        
+        return paths
+    
+    def _synthesize_with_retry(self, limiter: AdaptiveLimiter, text: str,
+                               language: str, output_path: str) -> str:
+        """Synthesize one utterance within the limiter, with retries."""
+        return self._call_with_retry(limiter, f"'{text[:30]}'",
+                                     lambda: self._synthesize(text, language, output_path))
+    
+    def _call_with_retry(self, limiter: AdaptiveLimiter, description: str, request):
+        """
+        Run a TTS request within the limiter, retrying failures with
+        exponential backoff. Throttling also lowers the in-flight cap.
+        """
+        for attempt in range(config.tts_max_retries + 1):
+            with limiter:
+                try:
+                    result = request()
+                except TTSThrottledError as e:
+                    limiter.throttled()
+                    error = e
+                except Exception as e:
+                    error = e
+                else:
+                    limiter.succeeded()
+                    return result
             
-            self.engine.generate_audio(en_text, "en", en_audio_path)
-            self.engine.generate_audio(ko_text, "ko", ko_audio_path)
+            if attempt == config.tts_max_retries:
+                raise error
             
-            audio_files.append((en_audio_path, ko_audio_path))
+            delay = 2 ** attempt * random.uniform(0.5, 1.5)
+            print(f"⚠️ TTS failed for {description} ({error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+    
+    def _cache_key(self, text: str, language: str, engine: Optional[TTSEngine] = None) -> str:
+        """TTS cache key of an utterance for an engine (the language's engine by default)."""
+        engine = engine or self.engines[language]
+        voice, speed = engine.voice_settings(language)
+        return self.cache.make_key(engine.name, voice, speed, language, text)
+    
+    def _synthesize(self, text: str, language: str, output_path: str) -> str:
+        """
+        Synthesize one utterance in memory, reusing cached audio when
+        available. Writing it to disk (cache entry or plain file) is optional.
+        """
+        if self.cache is None:
+            samples, words, engine = self._synthesize_hedged(text, language)
+            if config.tts_write_audio:
+                self._write_audio(output_path, samples, words)
+            register_pcm(output_path, samples)
+            register_word_timings(output_path, words)
+            self.served_by[output_path] = engine.name
+            return output_path
         
-        return audio_files
\ No newline at end of file
+        synthesized = []
+        
+        def synthesize_into(tmp_path: str) -> str:
+            samples, words, engine = self._synthesize_hedged(text, language)
+            self._write_audio(tmp_path, samples, words)
+            synthesized.append((samples, words, engine))
+            # Audio from the hedge engine is cached under its own key, so
+            # the primary engine is asked again next time
+            return self._cache_key(text, language, engine)
+        
+        path = self.cache.get_or_create(self._cache_key(text, language), synthesize_into)
+        if synthesized:
+            samples, words, engine = synthesized[0]
+            register_pcm(path, samples)
+            register_word_timings(path, words)
+            self.served_by[path] = engine.name
+        else:
+            self.served_by[path] = self.engines[language].name
+        return path
+    
+    def _synthesize_hedged(self, text: str, language: str) -> Tuple[np.ndarray, List[dict], TTSEngine]:
+        """
+        Synthesize with the language's engine, hedging with the hedge engine.
+        
+        The hedge request is sent once the primary request has run longer
+        than the latency percentile (or has failed); the first acceptable
+        result wins and the other request is left to finish unused.
+        
+        Returns:
+            Samples, word timings and the engine that produced them
+        """
+        primary = self.engines[language]
+        if self.hedge_engine is None or self.hedge_engine is primary:
+            return (*primary.synthesize(text, language), primary)
+        
+        tracker = self.latency[language]
+        started = time.monotonic()
+        hedge_at = started + tracker.threshold()
+        
+        def timed_primary():
+            result = primary.synthesize(text, language)
+            # Every completed primary request counts, won or not
+            tracker.record(time.monotonic() - started)
+            return result
+        
+        pending = {self._hedge_pool.submit(timed_primary): primary}
+        hedged = False
+        error = None
+        while True:
+            timeout = None if hedged else max(0.0, hedge_at - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                engine = pending.pop(future)
+                try:
+                    samples, words = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if self._acceptable(samples):
+                    if engine is not primary:
+                        with self._stats_lock:
+                            self.hedges_won += 1
+                    return samples, words, engine
+                error = Exception(f"{engine.name} returned no usable audio")
+            
+            if not hedged and (not pending or time.monotonic() >= hedge_at):
+                hedged = True
+                with self._stats_lock:
+                    self.hedges_fired += 1
+                pending[self._hedge_pool.submit(self.hedge_engine.synthesize, text, language)] = \
+                    self.hedge_engine
+            elif not pending:
+                raise error
+    
+    def _acceptable(self, samples: np.ndarray) -> bool:
+        """Whether synthesized audio is long enough and not silent."""
+        return (len(samples) >= self.MIN_AUDIO_SECONDS * SAMPLE_RATE and
+                float(np.max(np.abs(samples))) > 1e-3)
+    
+    @staticmethod
+    def _write_audio(output_path: str, samples: np.ndarray, words: List[dict]):
+        """Write in-memory audio with its decoded PCM and word timings."""
+        write_wav(output_path, samples)
+        save_pcm(output_path, samples)
+        if words:
+            save_word_timings(output_path, words)
+        else:
+            clear_word_timings(output_path)
\ No newline at end of file
@@ -1,19 +1,66 @@
 import os
-from typing import List, Tuple
+import re
+import json
+import math
+import time
+import bisect
+import tempfile
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from moviepy.editor import *
+from moviepy.config import get_setting
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 from src.core.config import config
+from src.utils.asset_arena import AssetArena
+from src.utils.audio_index import audio_index
+from src.utils.background_ingest import fit_background, load_render_ready
+from src.utils.pcm_cache import pcm_audio_clip
+from src.utils.render_budget import DEADLINE_SAFETY_FACTOR, RenderProfile, degradation_ladder
+from src.utils.timeline import INTRO_DURATION, OUTRO_DURATION, plan_lesson_duration, plan_sentence_timing
+from src.utils.word_timings import load_word_timings
 import textwrap
 
 
+@dataclass
+class LayoutProfile:
+    """Output frame geometry used to lay out the sentence timeline."""
+    name: str
+    width: int
+    height: int
+    max_text_ratio: float = 0.8  # Share of the frame width text may occupy
+
+
+LAYOUT_PROFILES = {
+    "landscape": LayoutProfile("landscape", config.video_width, config.video_height),
+    "vertical": LayoutProfile("vertical", 1080, 1920, max_text_ratio=0.85),
+}
+
+
 class VideoService:
-    def __init__(self):
-        self.width = config.video_width
-        self.height = config.video_height
+    OUTPUT_FPS = 30  # Standard YouTube FPS
+    PROBE_SECONDS = 1.0  # Length of the test render used to estimate render time
+    
+    def __init__(self, layout: str = "landscape", output_mode: Optional[str] = None):
+        if layout not in LAYOUT_PROFILES:
+            raise ValueError(f"Unknown layout profile: {layout}")
+        
+        self.output_mode = output_mode or config.video_output_mode
+        if self.output_mode not in ("mp4", "fmp4", "hls"):
+            raise ValueError(f"Unknown output mode: {self.output_mode}")
+        
+        self.layout = LAYOUT_PROFILES[layout]
+        self.width = self.layout.width
+        self.height = self.layout.height
         self.fps = config.video_fps
         self.sentence_duration = config.sentence_display_time
         self.transition_duration = config.transition_time
+        # Decoded backgrounds shared with other render processes
+        self.arena = AssetArena()
+        # Lowered by plan_render_profile when a deadline is tight
+        self.render_profile = RenderProfile()
     
     def wrap_text(self, text: str, font: ImageFont, max_width: int, draw: ImageDraw) -> str:
         """
@@ -61,33 +108,20 @@ class VideoService:
         """
         Create a text overlay with background board for better readability.
         """
+        img_array = self._render_text_overlay(text, position, font_size, color, with_background)
+        return ImageClip(img_array, duration=self.sentence_duration)
+    
+    def _render_text_overlay(self, text: str, position: str, font_size: int,
+                             color: str, with_background: bool) -> np.ndarray:
+        """Rasterize a text overlay (RGBA) for create_text_overlay."""
         # Create transparent image
         img = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
         draw = ImageDraw.Draw(img)
         
-        # Try to use fonts that support Korean characters
-        font_paths = [
-            "/System/Library/Fonts/AppleSDGothicNeo.ttc",  # macOS Korean font
-            "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
-            "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
-            "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",  # Linux Bold
-            "C:/Windows/Fonts/malgunbd.ttf",  # Windows Bold
-            "/System/Library/Fonts/Helvetica.ttc"  # Fallback
-        ]
-        
-        font = None
-        for font_path in font_paths:
-            try:
-                font = ImageFont.truetype(font_path, font_size)
-                break
-            except:
-                continue
-        
-        if font is None:
-            font = ImageFont.load_default()
+        font = self._load_font(font_size)
         
         # Apply text wrapping
-        max_text_width = int(self.width * 0.8)  # Use 80% of screen width
+        max_text_width = int(self.width * self.layout.max_text_ratio)
         wrapped_text = self.wrap_text(text, font, max_text_width, draw)
         
         # Get text size with wrapped text
@@ -144,9 +178,186 @@ class VideoService:
         # Draw main text
         draw.multiline_text((text_x, text_y), wrapped_text, font=font, fill=color, align="center")
         
-        # Convert to numpy array and create ImageClip
-        img_array = np.array(img)
-        return ImageClip(img_array, duration=self.sentence_duration)
+        return np.array(img)
+    
+    def create_karaoke_text_overlay(self, text: str, words: List[dict],
+                                    position: str = "center", font_size: int = 60,
+                                    color: str = "white", highlight_color: str = "#FFD700",
+                                    audio_offset: float = 0.0,
+                                    duration: Optional[float] = None) -> VideoClip:
+        """
+        Create a text overlay that highlights each word as it is spoken.
+        
+        The board is rasterized once with every word in its normal colour and
+        once with every word highlighted. Frames are built by pasting the
+        cached highlighted word sprites onto the normal board, so rendering
+        only selects sprites by timestamp.
+        
+        Args:
+            text: Text to display
+            words: Word timings ({"word", "start", "end"}) from the TTS sidecar
+            position: "center", "top" or "bottom"
+            font_size: Font size in pixels
+            color: Normal text colour
+            highlight_color: Colour of words already spoken
+            audio_offset: Time from the overlay start to the narration start
+            duration: Clip duration (defaults to the sentence display time)
+        """
+        font = self._load_font(font_size)
+        
+        measure_draw = ImageDraw.Draw(Image.new('RGBA', (100, 100), (0, 0, 0, 0)))
+        max_text_width = int(self.width * self.layout.max_text_ratio)
+        lines = self.wrap_text(text, font, max_text_width, measure_draw).split('\n')
+        
+        base = self._draw_karaoke_board(lines, font, position, color)
+        highlighted = self._draw_karaoke_board(lines, font, position, highlight_color)
+        
+        # Pre-cut one highlighted sprite per word
+        sprites = []
+        for left, top, right, bottom in self._karaoke_word_boxes(lines, font, position, measure_draw):
+            sprites.append((top, bottom, left, right, highlighted[top:bottom, left:right, :3].copy()))
+        
+        starts = self._match_word_starts([w for line in lines for w in line.split(' ')], words)
+        starts = [start + audio_offset for start in starts]
+        
+        base_rgb = base[:, :, :3]
+        state = {"count": -1, "frame": None}
+        
+        def make_frame(t):
+            count = bisect.bisect_right(starts, t)
+            if count != state["count"]:
+                frame = base_rgb.copy()
+                for top, bottom, left, right, sprite in sprites[:count]:
+                    frame[top:bottom, left:right] = sprite
+                state["count"] = count
+                state["frame"] = frame
+            return state["frame"]
+        
+        clip = VideoClip(make_frame, duration=duration or self.sentence_duration)
+        mask = ImageClip(base[:, :, 3] / 255.0, ismask=True).set_duration(clip.duration)
+        return clip.set_mask(mask)
+    
+    def _karaoke_board_geometry(self, lines: List[str], font, position: str,
+                                draw: ImageDraw) -> Tuple[int, int, int, int, int]:
+        """Return board x/y/width/height and line height for karaoke text."""
+        padding = 40
+        line_height = draw.textbbox((0, 0), "A", font=font)[3] + 4
+        text_width = max(int(draw.textlength(line, font=font)) for line in lines)
+        text_height = line_height * len(lines)
+        
+        board_width = text_width + padding * 2
+        board_height = text_height + padding * 2
+        board_x = (self.width - board_width) // 2
+        if position == "center":
+            board_y = (self.height - board_height) // 2
+        elif position == "top":
+            board_y = self.height // 6
+        else:  # bottom
+            board_y = self.height - (self.height // 4) - board_height // 2
+        
+        return board_x, board_y, board_width, board_height, line_height
+    
+    def _karaoke_line_origins(self, lines: List[str], font, position: str,
+                              draw: ImageDraw) -> List[Tuple[int, int]]:
+        """Top-left corner of each centred line of karaoke text."""
+        padding = 40
+        board_x, board_y, board_width, _, line_height = self._karaoke_board_geometry(
+            lines, font, position, draw)
+        text_width = board_width - padding * 2
+        
+        origins = []
+        for i, line in enumerate(lines):
+            line_width = int(draw.textlength(line, font=font))
+            origins.append((board_x + padding + (text_width - line_width) // 2,
+                            board_y + padding + i * line_height))
+        return origins
+    
+    def _draw_karaoke_board(self, lines: List[str], font, position: str,
+                            color: str) -> np.ndarray:
+        """Rasterize the frosted board and text lines in one colour (RGBA)."""
+        img = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        board_x, board_y, board_width, board_height, _ = self._karaoke_board_geometry(
+            lines, font, position, draw)
+        
+        board_img = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
+        ImageDraw.Draw(board_img).rounded_rectangle(
+            [board_x, board_y, board_x + board_width, board_y + board_height],
+            radius=30,
+            fill=(255, 255, 255, 80)  # Light white frosted glass effect
+        )
+        from PIL import ImageFilter
+        board_img = board_img.filter(ImageFilter.GaussianBlur(radius=5))
+        img = Image.alpha_composite(img, board_img)
+        draw = ImageDraw.Draw(img)
+        
+        shadow_offset = 3
+        for line, (x, y) in zip(lines, self._karaoke_line_origins(lines, font, position, draw)):
+            draw.text((x + shadow_offset, y + shadow_offset), line, font=font, fill=(0, 0, 0, 120))
+            draw.text((x, y), line, font=font, fill=color)
+        
+        return np.array(img)
+    
+    def _karaoke_word_boxes(self, lines: List[str], font, position: str,
+                            draw: ImageDraw) -> List[Tuple[int, int, int, int]]:
+        """Pixel box (including shadow) of every word, in reading order."""
+        shadow_offset = 3
+        boxes = []
+        for line, (x, y) in zip(lines, self._karaoke_line_origins(lines, font, position, draw)):
+            offset = 0
+            for word in line.split(' '):
+                word_x = x + int(draw.textlength(line[:offset], font=font))
+                left, top, right, bottom = draw.textbbox((word_x, y), word, font=font)
+                boxes.append((max(0, left), max(0, top),
+                              min(self.width, right + shadow_offset),
+                              min(self.height, bottom + shadow_offset)))
+                offset += len(word) + 1
+        return boxes
+    
+    @staticmethod
+    def _match_word_starts(tokens: List[str], words: List[dict]) -> List[float]:
+        """
+        Assign a start time to every displayed token from TTS word boundaries.
+        
+        Tokens are matched in order; a token without a boundary (e.g. a
+        stray symbol) lights up together with the previous word.
+        """
+        def normalize(value: str) -> str:
+            return re.sub(r'\W', '', value.lower())
+        
+        starts = []
+        next_word = 0
+        last_start = 0.0
+        for token in tokens:
+            token_key = normalize(token)
+            # Look a few boundaries ahead in case the engine split a token
+            for i in range(next_word, min(next_word + 3, len(words))):
+                word_key = normalize(words[i]["word"])
+                if word_key and token_key and (word_key in token_key or token_key in word_key):
+                    last_start = max(last_start, words[i]["start"])
+                    next_word = i + 1
+                    break
+            starts.append(last_start)
+        return starts
+    
+    def _load_font(self, font_size: int):
+        """Load the first available font that supports Korean characters."""
+        font_paths = [
+            "/System/Library/Fonts/AppleSDGothicNeo.ttc",  # macOS Korean font
+            "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
+            "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+            "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",  # Linux Bold
+            "C:/Windows/Fonts/malgunbd.ttf",  # Windows Bold
+            "/System/Library/Fonts/Helvetica.ttc"  # Fallback
+        ]
+        
+        for font_path in font_paths:
+            try:
+                return ImageFont.truetype(font_path, font_size)
+            except:
+                continue
+        
+        return ImageFont.load_default()
     
     def create_typing_text_overlay(self, text: str, position: str = "center",
                                  font_size: int = 60, color: str = "white",
@@ -181,24 +392,7 @@ class VideoService:
     def _create_text_with_board(self, text: str, position: str, font_size: int, 
                                 color: str, with_background: bool) -> np.ndarray:
         """Helper method to create text with background board."""
-        # Font setup
-        font_paths = [
-            "/System/Library/Fonts/AppleSDGothicNeo.ttc",
-            "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
-            "C:/Windows/Fonts/malgunbd.ttf",
-            "/System/Library/Fonts/Helvetica.ttc"
-        ]
-        
-        font = None
-        for font_path in font_paths:
-            try:
-                font = ImageFont.truetype(font_path, font_size)
-                break
-            except:
-                continue
-        
-        if font is None:
-            font = ImageFont.load_default()
+        font = self._load_font(font_size)
         
         # Create a small image just for measuring text
         test_img = Image.new('RGBA', (100, 100), (0, 0, 0, 0))
@@ -208,7 +402,7 @@ class VideoService:
         full_text = text.rstrip('|')
         
         # Apply text wrapping
-        max_text_width = int(self.width * 0.8)  # Use 80% of screen width
+        max_text_width = int(self.width * self.layout.max_text_ratio)
         wrapped_full_text = self.wrap_text(full_text, font, max_text_width, test_draw)
         
         bbox = test_draw.multiline_textbbox((0, 0), wrapped_full_text, font=font)
@@ -274,24 +468,7 @@ class VideoService:
         Create text overlay with typing animation that preserves background.
         Uses ImageClip with mask for proper transparency.
         """
-        # Font setup
-        font_paths = [
-            "/System/Library/Fonts/AppleSDGothicNeo.ttc",
-            "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
-            "C:/Windows/Fonts/malgunbd.ttf",
-            "/System/Library/Fonts/Helvetica.ttc"
-        ]
-        
-        font = None
-        for font_path in font_paths:
-            try:
-                font = ImageFont.truetype(font_path, font_size)
-                break
-            except:
-                continue
-        
-        if font is None:
-            font = ImageFont.load_default()
+        font = self._load_font(font_size)
         
         # Pre-calculate dimensions
         test_img = Image.new('RGBA', (100, 100), (0, 0, 0, 0))
@@ -373,6 +550,27 @@ class VideoService:
         
         return clip
     
+    def _load_background(self, background_path: str) -> np.ndarray:
+        """
+        Center-crop a background image to the layout aspect ratio and
+        scale it to the output frame size.
+        
+        Backgrounds fetched by ImageService already have a render-ready
+        frame for the landscape layout, which is memory-mapped as is.
+        Otherwise cropping happens at the source resolution so that
+        vertical layouts keep the middle of a landscape photo instead of
+        squashing it, and the result is kept in the asset arena, so other
+        processes rendering with the same background attach to it instead
+        of decoding it again.
+        """
+        frame = load_render_ready(background_path, self.width, self.height)
+        if frame is not None:
+            return frame
+        
+        key = self.arena.make_key("background", *AssetArena.source_key(background_path),
+                                  self.width, self.height)
+        return self.arena.get(key, lambda: fit_background(background_path, self.width, self.height))
+    
     def create_sentence_clip(self, background_path: str, 
                            en_audio_path: str, ko_audio_path: str,
                            en_text: str, ko_text: str, 
@@ -381,19 +579,21 @@ class VideoService:
         Create a video clip for one sentence pair.
         """
         # Load background image
-        background = ImageClip(background_path).set_duration(self.sentence_duration)
-        background = background.resize((self.width, self.height))
+        background = ImageClip(self._load_background(background_path))
+        background = background.set_duration(self.sentence_duration)
         
         # Add subtle zoom effect
-        background = background.resize(lambda t: 1 + 0.02 * t)
+        if self.render_profile.zoom:
+            background = background.resize(lambda t: 1 + 0.02 * t)
         
         # Create header with sentence number
         header_text = f"Sentence #{sentence_number}"
         header = self.create_text_overlay(header_text, "top", 35, "#FFD700", with_background=True)
         
         # Load audio first to calculate typing speed based on audio duration
-        en_audio = AudioFileClip(en_audio_path)
-        ko_audio = AudioFileClip(ko_audio_path)
+        # Decoded PCM is memory-mapped, so no ffmpeg readers are spawned
+        en_audio = pcm_audio_clip(en_audio_path)
+        ko_audio = pcm_audio_clip(ko_audio_path)
         
         # Calculate typing speed to match audio duration
         # Make typing finish just before audio ends
@@ -404,64 +604,62 @@ class VideoService:
         en_typing_speed = max(0.02, min(0.08, en_typing_speed))
         ko_typing_speed = max(0.02, min(0.08, ko_typing_speed))
         
-        # Create text overlays without typing animation for faster rendering
+        # Static text overlays, rasterized once per language and reused by
+        # every section that shows the text without highlighting
         # TODO: Re-enable typing animation after performance optimization
-        en_text_overlay = self.create_text_overlay(en_text, "center", 55, "white", with_background=True)
-        ko_text_overlay = self.create_text_overlay(ko_text, "bottom", 50, "#87CEEB", with_background=True)
-        
-        # Create static English text for Korean section (no typing animation)
         en_text_static = self.create_text_overlay(en_text, "center", 55, "white", with_background=True)
+        ko_text_static = self.create_text_overlay(ko_text, "bottom", 50, "#87CEEB", with_background=True)
+        en_text_overlay = en_text_static
+        ko_text_overlay = ko_text_static
         
         # Calculate timings with longer pauses for learning
-        en_typing_duration = en_text_overlay.duration
-        ko_typing_duration = ko_text_overlay.duration
-        en_audio_duration = en_audio.duration
-        ko_audio_duration = ko_audio.duration
+        timing = plan_sentence_timing(en_audio.duration, ko_audio.duration)
         
-        # Longer pauses for better learning experience
-        pause_after_typing = 1.0  # Pause after typing completes
-        pause_after_audio = 2.0   # Pause after audio completes for comprehension
-        pause_before_repeat = 1.0  # Pause before repeating English
-        
-        # English section timing
-        en_text_start = 0
-        en_audio_start = 0.3  # Start audio shortly after typing begins
-        en_section_duration = en_audio_start + en_audio_duration + pause_after_audio
-        
-        # Korean section timing  
-        ko_text_start = en_section_duration
-        ko_audio_start = ko_text_start + 0.3
-        ko_section_duration = 0.3 + ko_audio_duration + pause_after_audio
-        
-        # English repeat section timing
-        en_repeat_start = en_section_duration + ko_section_duration
-        en_repeat_audio_start = en_repeat_start + pause_before_repeat
-        en_repeat_section_duration = pause_before_repeat + en_audio_duration + pause_after_audio
-        
-        total_duration = en_section_duration + ko_section_duration + en_repeat_section_duration
+        # Highlight words in sync with the narration when TTS reported timings
+        en_text_repeat = en_text_static
+        if config.karaoke_highlight:
+            en_words = load_word_timings(en_audio_path)
+            ko_words = load_word_timings(ko_audio_path)
+            
+            if en_words:
+                en_text_overlay = self.create_karaoke_text_overlay(
+                    en_text, en_words, "center", 55, "white",
+                    audio_offset=timing.en_audio_start - timing.en_text_start,
+                    duration=timing.en_section_duration
+                )
+                en_text_repeat = self.create_karaoke_text_overlay(
+                    en_text, en_words, "center", 55, "white",
+                    audio_offset=timing.en_repeat_audio_start - timing.en_repeat_start,
+                    duration=timing.en_repeat_section_duration
+                )
+            if ko_words:
+                ko_text_overlay = self.create_karaoke_text_overlay(
+                    ko_text, ko_words, "bottom", 50, "#87CEEB",
+                    audio_offset=timing.ko_audio_start - timing.ko_text_start,
+                    duration=timing.ko_section_duration
+                )
         
         # Set timings for text and audio
         # English typing animation only during English section
-        en_text_timed = en_text_overlay.set_start(en_text_start).set_duration(en_section_duration)
+        en_text_timed = en_text_overlay.set_start(timing.en_text_start).set_duration(timing.en_section_duration)
         # Static English text during Korean section
-        en_text_static_timed = en_text_static.set_start(ko_text_start).set_duration(ko_section_duration)
-        # Static English text during English repeat section
-        en_text_static_repeat = en_text_static.set_start(en_repeat_start).set_duration(en_repeat_section_duration)
-        ko_text_timed = ko_text_overlay.set_start(ko_text_start)
+        en_text_static_timed = en_text_static.set_start(timing.ko_text_start).set_duration(timing.ko_section_duration)
+        # English text during English repeat section (highlighted again if timings exist)
+        en_text_static_repeat = en_text_repeat.set_start(timing.en_repeat_start).set_duration(timing.en_repeat_section_duration)
+        ko_text_timed = ko_text_overlay.set_start(timing.ko_text_start)
         # Korean text also visible during English repeat section
-        ko_text_static = self.create_text_overlay(ko_text, "bottom", 50, "#87CEEB", with_background=True)
-        ko_text_static_timed = ko_text_static.set_start(en_repeat_start).set_duration(en_repeat_section_duration)
+        ko_text_static_timed = ko_text_static.set_start(timing.en_repeat_start).set_duration(timing.en_repeat_section_duration)
         
-        en_audio_timed = en_audio.set_start(en_audio_start)
-        ko_audio_timed = ko_audio.set_start(ko_audio_start)
-        en_audio_repeat = en_audio.set_start(en_repeat_audio_start)
+        en_audio_timed = en_audio.set_start(timing.en_audio_start)
+        ko_audio_timed = ko_audio.set_start(timing.ko_audio_start)
+        en_audio_repeat = en_audio.set_start(timing.en_repeat_audio_start)
         
         # Combine audio
         audio = CompositeAudioClip([en_audio_timed, ko_audio_timed, en_audio_repeat])
         
         # Update background duration
-        background = background.set_duration(total_duration)
-        header = header.set_duration(total_duration)
+        background = background.set_duration(timing.total_duration)
+        header = header.set_duration(timing.total_duration)
         
         # Composite video
         video = CompositeVideoClip([
@@ -523,7 +721,14 @@ class VideoService:
         
         # Create static gradient background instead of animated for better performance
         gradient = make_frame(0)  # Use first frame as static background
-        background = ImageClip(gradient).set_duration(4)
+        background = ImageClip(gradient).set_duration(INTRO_DURATION)
+        
+        if not self.render_profile.animated_intro:
+            return self._still_clip([
+                background,
+                self.create_text_overlay(title, "center", 80, "white", with_background=True),
+                self.create_text_overlay(subtitle, "bottom", 40, "#FFD700", with_background=True)
+            ], INTRO_DURATION)
         
         # Create title with fade effect instead of typing for better performance
         title_clip = self.create_text_overlay(title, "center", 80, "white", with_background=True)
@@ -546,7 +751,7 @@ class VideoService:
             draw.ellipse([0, 0, circle_size, circle_size], 
                         fill=(255, 255, 255, 30))  # Semi-transparent white
             
-            circle_clip = ImageClip(np.array(circle_img)).set_duration(4)
+            circle_clip = ImageClip(np.array(circle_img)).set_duration(INTRO_DURATION)
             # Random starting position
             start_x = random.randint(0, self.width - circle_size)
             start_y = random.randint(0, self.height - circle_size)
@@ -572,6 +777,12 @@ class VideoService:
         
         return intro
     
+    def _still_clip(self, layers: List[VideoClip], duration: float) -> ImageClip:
+        """Compose layers once and hold the result as a single still frame."""
+        layers = [layer.set_duration(duration) for layer in layers]
+        frame = CompositeVideoClip(layers, size=(self.width, self.height)).get_frame(0)
+        return ImageClip(frame).set_duration(duration)
+    
     def create_animated_subscribe_button(self) -> VideoClip:
         """Create an animated subscribe button without artifacts."""
         # Create a clean subscribe button overlay
@@ -739,12 +950,21 @@ class VideoService:
         
         # Create static gradient background for better performance
         gradient = make_particle_background(0)  # Use first frame as static background
-        background = ImageClip(gradient).set_duration(6)
+        background = ImageClip(gradient).set_duration(OUTRO_DURATION)
+        
+        if not self.render_profile.animated_intro:
+            return self._still_clip([
+                background,
+                self.create_text_overlay("Thank you for watching!", "top", 70, "white",
+                                         with_background=True),
+                self.create_text_overlay("See you in the next lesson! 📚", "bottom", 35, "#87CEEB",
+                                         with_background=True)
+            ], OUTRO_DURATION)
         
         # Create thank you message with wave animation
         thank_you_text = "Thank you for watching!"
         thank_you_clip = self.create_text_overlay(thank_you_text, "top", 70, "white", with_background=True)
-        thank_you_clip = thank_you_clip.set_duration(6)
+        thank_you_clip = thank_you_clip.set_duration(OUTRO_DURATION)
         # Wave animation for text
         thank_you_clip = thank_you_clip.set_position(
             lambda t: ('center', 100 + np.sin(t * 3) * 20)
@@ -756,7 +976,7 @@ class VideoService:
         # Create next video teaser
         next_video_text = "See you in the next lesson! 📚"
         next_video_clip = self.create_text_overlay(next_video_text, "bottom", 35, "#87CEEB", with_background=True)
-        next_video_clip = next_video_clip.set_duration(4).set_start(2)
+        next_video_clip = next_video_clip.set_duration(OUTRO_DURATION - 2).set_start(2)
         next_video_clip = next_video_clip.crossfadein(0.5)
         
         # Add floating emoji decorations
@@ -764,7 +984,7 @@ class VideoService:
         emoji_clips = []
         for i, emoji in enumerate(emojis):
             emoji_clip = self.create_text_overlay(emoji, "center", 40, "white", with_background=False)
-            emoji_clip = emoji_clip.set_duration(6)
+            emoji_clip = emoji_clip.set_duration(OUTRO_DURATION)
             
             # Random starting position around the edges
             if i % 2 == 0:
@@ -827,7 +1047,7 @@ class VideoService:
         # Create "Don't forget to" text
         reminder_text = "Don't forget to"
         reminder_clip = self.create_text_overlay(reminder_text, "center", 30, "#FFD700", with_background=True)
-        reminder_clip = reminder_clip.set_duration(6)
+        reminder_clip = reminder_clip.set_duration(OUTRO_DURATION)
         reminder_clip = reminder_clip.set_position(('center', container_y - 80))
         reminder_clip = reminder_clip.crossfadein(0.3)
         
@@ -845,15 +1065,30 @@ class VideoService:
                          background_music_path: str,
                          output_path: str,
                          title: str = "Daily English Study",
-                         subtitle: str = "Learn with Us"):
+                         subtitle: str = "Learn with Us",
+                         deadline: Optional[datetime] = None,
+                         tts_engines: Optional[Dict[str, str]] = None,
+                         image_sources: Optional[Dict[str, str]] = None):
         """
         Create the complete video from all components.
+        
+        When a deadline is given, render quality is stepped down as far as
+        needed for the render to finish by then (see plan_render_profile).
+        tts_engines (audio path -> engine name, see TTSService.served_by) and
+        image_sources (image path -> origin, see ImageService.image_sources)
+        are recorded per sentence in the timeline.
         """
+        render_started = time.monotonic()
+        if deadline:
+            self.plan_render_profile(sentences, audio_files, image_paths, deadline)
+        
         clips = []
+        segments = []
         
         # Add intro
         intro = self.create_intro_clip(title, subtitle)
         clips.append(intro)
+        segments.append({"type": "intro"})
         
         # Create clips for each sentence
         for i, ((en_text, ko_text), (en_audio, ko_audio), img_path) in enumerate(
@@ -864,19 +1099,260 @@ class VideoService:
                 en_text, ko_text, i + 1
             )
             clips.append(clip)
+            segments.append({
+                "type": "sentence",
+                "number": i + 1,
+                "english": en_text,
+                "korean": ko_text
+            })
+            if tts_engines:
+                segments[-1]["tts"] = {"en": tts_engines.get(en_audio),
+                                       "ko": tts_engines.get(ko_audio)}
+            if image_sources:
+                segments[-1]["background"] = image_sources.get(img_path)
         
         # Add outro
         outro = self.create_outro_clip()
         clips.append(outro)
+        segments.append({"type": "outro"})
+        
+        timeline = self._build_timeline(clips, segments, output_path)
         
         # Concatenate all clips with transitions
         final_video = concatenate_videoclips(clips, method="compose")
         
+        # Keep the speech-only mix so compilations can lay a new music bed
+        timeline["speech_audio"] = self._save_speech_track(final_video, output_path)
+        
         # Add background music
+        final_video = self._add_background_music(final_video, background_music_path)
+        
+        self._write_video(final_video, output_path,
+                          keyframe_times=[seg["start"] for seg in timeline["segments"]])
+        
+        timeline["render"] = {
+            "profile": self.render_profile.name,
+            "degradations": self.render_profile.degradations,
+            "deadline": deadline.isoformat(timespec="seconds") if deadline else None,
+            "render_seconds": round(time.monotonic() - render_started, 1)
+        }
+        self._save_timeline(timeline, output_path)
+        
+        return output_path
+    
+    def plan_render_profile(self, sentences: List[Tuple[str, str]],
+                            audio_files: List[Tuple[str, str]],
+                            image_paths: List[str],
+                            deadline: datetime) -> RenderProfile:
+        """
+        Pick the best render profile that is expected to finish by the deadline.
+        
+        The video length is known from the sentence timeline before any frame
+        is rendered. Each quality level is calibrated with a short test render
+        of a sentence on this machine, so a contended box steps down further.
+        If even the cheapest level is too slow it is used anyway.
+        
+        Args:
+            sentences: List of (english, korean) sentence tuples
+            audio_files: List of (english_audio_path, korean_audio_path) tuples
+            image_paths: Background image path for each sentence
+            deadline: Wall-clock time the video must be ready by
+        
+        Returns:
+            The chosen profile (also set as self.render_profile)
+        """
+        sentence_seconds = plan_lesson_duration(audio_files, audio_index.duration, with_bookends=False)
+        bookend_seconds = INTRO_DURATION + OUTRO_DURATION
+        
+        print(f"⏱️ Planning render for {sentence_seconds + bookend_seconds:.0f}s of video "
+              f"before {deadline.strftime('%H:%M:%S')}")
+        
+        ladder = degradation_ladder()
+        for profile in ladder:
+            self.render_profile = profile
+            if datetime.now() >= deadline:
+                # No time left to calibrate, go straight to the cheapest settings
+                self.render_profile = ladder[-1]
+                print(f"⚠️ Deadline already passed, using the cheapest settings")
+                break
+            (en_text, ko_text), (en_audio, ko_audio) = sentences[0], audio_files[0]
+            estimate = sentence_seconds * self._probe_render_rate(
+                self.create_sentence_clip(image_paths[0], en_audio, ko_audio, en_text, ko_text, 1))
+            # Still intros/outros cost next to nothing to render
+            if profile.animated_intro:
+                estimate += bookend_seconds * self._probe_render_rate(self.create_outro_clip())
+            estimate *= DEADLINE_SAFETY_FACTOR
+            remaining = (deadline - datetime.now()).total_seconds()
+            print(f"   {profile.name}: ~{estimate:.0f}s needed, {remaining:.0f}s left")
+            if estimate <= remaining:
+                break
+        else:
+            print(f"⚠️ Cheapest settings may still miss the deadline, rendering anyway")
+        
+        if self.render_profile.degradations:
+            print(f"⚠️ Render degraded to meet deadline: {', '.join(self.render_profile.degradations)}")
+        return self.render_profile
+    
+    def _probe_render_rate(self, clip: VideoClip) -> float:
+        """Wall-clock seconds needed per second of video like clip with the current profile."""
+        start = clip.duration / 2
+        probe = clip.subclip(start, min(clip.duration, start + self.PROBE_SECONDS))
+        
+        fd, probe_path = tempfile.mkstemp(suffix=".mp4", dir=config.video_output_dir)
+        os.close(fd)
+        try:
+            started = time.monotonic()
+            probe.write_videofile(probe_path, audio=False, logger=None,
+                                  **self._encoder_settings())
+            return (time.monotonic() - started) / probe.duration
+        finally:
+            clip.close()
+            os.remove(probe_path)
+    
+    def _encoder_settings(self) -> dict:
+        """Video encoder arguments for write_videofile under the current profile."""
+        ffmpeg_params = []
+        if self.render_profile.fps != self.OUTPUT_FPS:
+            # Compose fewer frames but keep the output rate by repeating them
+            ffmpeg_params = ['-r', str(self.OUTPUT_FPS)]
+        
+        return {
+            "fps": self.render_profile.fps,
+            "codec": 'libx264',
+            "preset": self.render_profile.preset,  # 'slow' gives better quality encoding
+            "bitrate": '8000k',  # High bitrate for 1080p (8 Mbps)
+            "threads": 4,  # Use multiple threads
+            "ffmpeg_params": ffmpeg_params
+        }
+    
+    def create_shorts_video(self, sentences: List[Tuple[str, str]],
+                            audio_files: List[Tuple[str, str]],
+                            image_paths: List[str],
+                            background_music_path: str,
+                            output_path: str,
+                            sentence_indices: Optional[List[int]] = None):
+        """
+        Render a short clip of selected sentences using this service's layout.
+        
+        Uses the TTS files, background images and adjusted music already
+        produced for the main video, so only the frames are rendered again.
+        
+        Args:
+            sentences: List of (english, korean) sentence tuples
+            audio_files: List of (english_audio_path, korean_audio_path) tuples
+            image_paths: Background image path for each sentence
+            background_music_path: Adjusted background music file
+            output_path: Where to write the short video
+            sentence_indices: Zero-based indices of sentences to include
+                (defaults to the first config.shorts_sentence_count)
+            
+        Returns:
+            Path to the rendered video
+        """
+        if sentence_indices is None:
+            sentence_indices = list(range(min(config.shorts_sentence_count, len(sentences))))
+        
+        clips = []
+        segments = []
+        for i in sentence_indices:
+            en_text, ko_text = sentences[i]
+            en_audio, ko_audio = audio_files[i]
+            clips.append(self.create_sentence_clip(
+                image_paths[i], en_audio, ko_audio,
+                en_text, ko_text, i + 1
+            ))
+            segments.append({
+                "type": "sentence",
+                "number": i + 1,
+                "english": en_text,
+                "korean": ko_text
+            })
+        
+        if not clips:
+            raise ValueError("No sentences selected for the short video")
+        
+        timeline = self._build_timeline(clips, segments, output_path)
+        
+        final_video = concatenate_videoclips(clips, method="compose")
+        final_video = self._add_background_music(final_video, background_music_path)
+        
+        self._write_video(final_video, output_path,
+                          keyframe_times=[seg["start"] for seg in timeline["segments"]])
+        self._save_timeline(timeline, output_path)
+        
+        return output_path
+    
+    def _build_timeline(self, clips: List[VideoClip], segments: List[dict],
+                        output_path: str) -> dict:
+        """
+        Work out where each clip lands in the concatenated video.
+        
+        Boundaries are snapped to the first output frame at or after the
+        clip start, which is where the encoder places the forced keyframe.
+        """
+        fps = self.OUTPUT_FPS
+        position = 0.0
+        boundaries = []
+        for clip in clips:
+            boundaries.append(position)
+            position += clip.duration
+        boundaries.append(position)
+        
+        # Small epsilon keeps exact frame times from rounding up a frame
+        frames = [math.ceil(t * fps - 1e-6) for t in boundaries]
+        
+        timed_segments = []
+        for segment, start_frame, end_frame in zip(segments, frames, frames[1:]):
+            timed = dict(segment)
+            timed["start"] = round(start_frame / fps, 6)
+            timed["end"] = round(end_frame / fps, 6)
+            timed_segments.append(timed)
+        
+        return {
+            "video": os.path.basename(output_path),
+            "layout": self.layout.name,
+            "width": self.width,
+            "height": self.height,
+            "fps": fps,
+            "duration": position,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "segments": timed_segments
+        }
+    
+    def _save_speech_track(self, video: VideoClip, output_path: str) -> Optional[str]:
+        """
+        Write the narration audio (before background music) next to the video.
+        
+        Returns:
+            File name of the speech track, or None if the video has no audio
+        """
+        if video.audio is None:
+            return None
+        
+        speech_path = os.path.splitext(output_path)[0] + "_speech.m4a"
+        video.audio.write_audiofile(
+            speech_path,
+            fps=44100,
+            codec='aac',
+            bitrate='192k',
+            logger=None
+        )
+        return os.path.basename(speech_path)
+    
+    def _save_timeline(self, timeline: dict, output_path: str) -> str:
+        """Write the segment timeline next to the video as a JSON sidecar."""
+        timeline_path = os.path.splitext(output_path)[0] + "_timeline.json"
+        with open(timeline_path, 'w', encoding='utf-8') as f:
+            json.dump(timeline, f, ensure_ascii=False, indent=2)
+        return timeline_path
+    
+    def _add_background_music(self, final_video: VideoClip,
+                              background_music_path: str) -> VideoClip:
+        """Mix the background music track under the video's own audio."""
         if background_music_path and os.path.exists(background_music_path):
             try:
                 print(f"🎵 Adding background music from: {background_music_path}")
-                bg_music = AudioFileClip(background_music_path)
+                bg_music = pcm_audio_clip(background_music_path)
                 print(f"   Music duration: {bg_music.duration:.1f}s, Video duration: {final_video.duration:.1f}s")
                 
                 # Ensure background music matches video duration
@@ -910,25 +1386,126 @@ class VideoService:
         else:
             print(f"⚠️ No background music path provided or file doesn't exist: {background_music_path}")
         
+        return final_video
+    
+    def render_segment(self, clip: VideoClip, output_path: str) -> str:
+        """
+        Encode a standalone video-only segment (e.g. an intro) with the same
+        encoder settings as full videos, so it can be joined to previously
+        rendered segments by stream copy.
+        """
+        self._write_video(clip, output_path, audio=False)
+        return output_path
+    
+    def reencode_segment(self, video_path: str, start: float, end: float, output_path: str) -> str:
+        """
+        Re-encode the [start, end) range of a video (video only) with this
+        service's encoder settings, for segments of videos rendered under
+        another profile that can't be joined by stream copy.
+        """
+        settings = self._encoder_settings()
+        result = subprocess.run([
+            get_setting("FFMPEG_BINARY"),
+            '-y',
+            '-loglevel', 'error',
+            '-ss', f"{start:.6f}",
+            '-i', video_path,
+            '-t', f"{end - start:.6f}",
+            '-frames:v', str(round((end - start) * self.OUTPUT_FPS)),
+            '-map', '0:v',
+            '-an',
+            '-c:v', settings["codec"],
+            '-preset', settings["preset"],
+            '-b:v', settings["bitrate"],
+            '-pix_fmt', 'yuv420p',
+            '-r', str(self.OUTPUT_FPS),
+            output_path
+        ], capture_output=True, text=True)
+        
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to re-encode {video_path}: {result.stderr.strip()}")
+        return output_path
+    
+    def _write_video(self, final_video: VideoClip, output_path: str,
+                     keyframe_times: Optional[List[float]] = None,
+                     audio: bool = True):
+        """
+        Encode the composed video to disk and release its readers.
+        
+        Args:
+            final_video: Composed video clip
+            output_path: Destination file
+            keyframe_times: Times (seconds) that must start with a keyframe,
+                so segments can later be cut with stream copy
+            audio: Whether to encode the clip's audio track
+        """
+        keyframe_times = list(keyframe_times or [])
+        target_path = output_path
+        settings = self._encoder_settings()
+        ffmpeg_params = settings.pop("ffmpeg_params")
+        
+        if self.output_mode in ("fmp4", "hls"):
+            # Regular keyframes so fragments/segments are closed at a steady pace
+            segment_time = config.progressive_segment_time
+            keyframe_times += [i * segment_time
+                               for i in range(int(final_video.duration // segment_time) + 1)]
+        
+        if keyframe_times:
+            ffmpeg_params += [
+                '-force_key_frames',
+                ','.join(f"{t:.6f}" for t in sorted(set(keyframe_times)))
+            ]
+        
+        if self.output_mode == "fmp4":
+            # Each fragment is usable as soon as it is written
+            ffmpeg_params += ['-movflags', '+frag_keyframe+empty_moov+default_base_moof']
+        elif self.output_mode == "hls":
+            hls_dir = os.path.splitext(output_path)[0] + "_hls"
+            os.makedirs(hls_dir, exist_ok=True)
+            target_path = os.path.join(hls_dir, "playlist.m3u8")
+            ffmpeg_params += [
+                '-f', 'hls',
+                '-hls_time', str(config.progressive_segment_time),
+                '-hls_playlist_type', 'event',
+                '-hls_segment_type', 'fmp4',
+                '-hls_fmp4_init_filename', 'init.mp4',
+                '-hls_segment_filename', os.path.join(hls_dir, 'segment_%05d.m4s')
+            ]
+            print(f"📡 Streaming HLS segments to: {target_path}")
+        
         # Write the final video with progress tracking
         print(f"🎬 Starting video rendering... This may take a few minutes.")
         print(f"📊 Total duration: {final_video.duration:.1f} seconds")
         
         final_video.write_videofile(
-            output_path,
-            fps=30,  # Standard YouTube FPS
-            codec='libx264',
+            target_path,
+            audio=audio,
             audio_codec='aac',
             temp_audiofile='temp-audio.m4a',
             remove_temp=True,
-            preset='slow',  # Better quality encoding
-            bitrate='8000k',  # High bitrate for 1080p (8 Mbps)
             audio_bitrate='192k',  # High quality audio
-            threads=4,  # Use multiple threads
-            logger='bar'  # Show progress bar
+            ffmpeg_params=ffmpeg_params,
+            logger='bar',  # Show progress bar
+            **settings
         )
         
         # Clean up
         final_video.close()
         
-        return output_path
\ No newline at end of file
+        if self.output_mode == "hls":
+            # Join the finished segments into a regular file for later steps
+            self._remux_playlist(target_path, output_path)
+    
+    def _remux_playlist(self, playlist_path: str, output_path: str):
+        """Copy the streams of a finished HLS playlist into a single MP4."""
+        result = subprocess.run([
+            get_setting("FFMPEG_BINARY"),
+            '-y',
+            '-loglevel', 'error',
+            '-i', playlist_path,
+            '-c', 'copy',
+            output_path
+        ], capture_output=True, text=True)
+        
+        if result.returncode != 0:
+            raise RuntimeError(f"Could not remux {playlist_path}: {result.stderr.strip()}")
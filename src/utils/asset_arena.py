@@ -0,0 +1,128 @@
+"""Decoded render assets shared between processes through memory-mapped files."""
+import os
+import time
+import hashlib
+import tempfile
+from typing import Callable, Dict, Iterable
+import numpy as np
+from src.core.config import config
+
+
+class AssetArena:
+    """
+    Store decoded, render-ready arrays (resized backgrounds) once on disk and
+    attach to them read-only with np.memmap.
+
+    Every process rendering clips opens the same file, so the pages are
+    shared through the OS page cache: memory stays flat as workers are added
+    and a JPEG is decoded and resized only by the first process that needs it.
+    The arena is kept under a size budget by evicting the least recently used
+    entries; entries attached by this process are never evicted by it.
+    """
+
+    def __init__(self, arena_dir: str = None, max_bytes: int = None):
+        self.arena_dir = arena_dir or config.asset_arena_dir
+        self.max_bytes = max_bytes if max_bytes is not None else config.asset_arena_max_mb * 1024 * 1024
+        os.makedirs(self.arena_dir, exist_ok=True)
+        self._attached: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def make_key(kind: str, *parts) -> str:
+        """Build an arena key from an asset kind and the inputs that define it."""
+        digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:20]
+        return f"{kind}_{digest}"
+
+    @staticmethod
+    def source_key(path: str) -> tuple:
+        """Identify a source file by path, size and modification time."""
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_size, int(stat.st_mtime))
+
+    def get(self, key: str, build: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        Return the read-only array stored under key, building it if missing.
+
+        Args:
+            key: Arena key from make_key
+            build: Called once to produce the array when it isn't stored yet
+
+        Returns:
+            Read-only memory-mapped array
+        """
+        if key in self._attached:
+            return self._attached[key]
+
+        path = os.path.join(self.arena_dir, key + ".npy")
+        stored = False
+        if os.path.exists(path):
+            # Access time marks the entry as recently used (mounts may not update it on read)
+            try:
+                os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+            except FileNotFoundError:
+                pass  # Evicted by another process in between
+        if not os.path.exists(path):
+            array = np.ascontiguousarray(build())
+            # Write to a temp file first so other workers never map a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.arena_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, array)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            stored = True
+
+        array = np.load(path, mmap_mode='r')
+        self._attached[key] = array
+        if stored:
+            self.evict()
+        return array
+
+    def evict(self, keep: Iterable[str] = ()):
+        """
+        Remove least recently used entries until the arena fits its budget.
+
+        Processes that already mapped an evicted entry keep reading it; the
+        file's pages are released once the last mapping is closed.
+
+        Args:
+            keep: Keys that must stay, in addition to those attached by this process
+        """
+        keep = set(keep) | set(self._attached)
+        entries = []
+        total = 0
+        for filename in os.listdir(self.arena_dir):
+            if not filename.endswith(".npy"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.arena_dir, filename))
+            except FileNotFoundError:
+                continue
+            total += stat.st_size
+            entries.append((stat.st_atime, filename, stat.st_size))
+        if total <= self.max_bytes:
+            return
+
+        for _, filename, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if filename[:-len(".npy")] in keep:
+                continue
+            try:
+                os.remove(os.path.join(self.arena_dir, filename))
+            except FileNotFoundError:
+                pass  # Evicted by another process
+            total -= size
+
+    def cleanup(self, days: int = 7):
+        """Remove arena entries that haven't been written for the given days."""
+        cutoff = time.time() - days * 24 * 3600
+        for filename in os.listdir(self.arena_dir):
+            file_path = os.path.join(self.arena_dir, filename)
+            try:
+                if os.path.isfile(file_path) and os.path.getmtime(file_path) < cutoff:
+                    os.remove(file_path)
+            except OSError as e:
+                print(f"Error cleaning arena entry: {e}")
@@ -0,0 +1,114 @@
+"""Duration and loudness index of speech and music files."""
+import os
+import json
+import math
+import tempfile
+import threading
+import numpy as np
+from src.core.config import config
+from src.utils.pcm_cache import SAMPLE_RATE, load_pcm, registered_pcm
+
+
+class AudioIndex:
+    """
+    Duration and loudness of audio files, kept in a JSON file next to the
+    TTS cache so planning never has to open or decode a clip.
+
+    Entries are filled when TTS audio is written (record) or on the first
+    lookup, and are re-probed when a file's size or modification time changes.
+    Utterances that only exist in memory are indexed for this process only.
+    """
+
+    def __init__(self, index_path: str = None):
+        self.index_path = index_path or config.audio_index_path
+        self._entries = None
+        self._memory_entries = {}
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.index_path):
+                try:
+                    with open(self.index_path, 'r', encoding='utf-8') as f:
+                        self._entries = json.load(f)
+                except (OSError, ValueError):
+                    # A damaged index is rebuilt from the audio files
+                    self._entries = {}
+
+    def get(self, audio_path: str) -> dict:
+        """
+        Return {"duration", "rms_db", "peak_db"} for an audio file.
+
+        Args:
+            audio_path: Speech or music file
+
+        Returns:
+            Index entry (probed from the decoded PCM if missing or stale)
+        """
+        key = os.path.abspath(audio_path)
+        if not os.path.exists(audio_path) and registered_pcm(audio_path) is not None:
+            with self._lock:
+                if key not in self._memory_entries:
+                    self._memory_entries[key] = self._probe(audio_path)
+                return self._memory_entries[key]
+
+        stat = os.stat(audio_path)
+
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+                return entry
+
+        entry = self._probe(audio_path)
+        entry["size"] = stat.st_size
+        entry["mtime"] = stat.st_mtime_ns
+
+        with self._lock:
+            self._entries[key] = entry
+            self._dirty = True
+        return entry
+
+    def duration(self, audio_path: str) -> float:
+        """Duration of an audio file in seconds."""
+        return self.get(audio_path)["duration"]
+
+    def record(self, audio_path: str) -> dict:
+        """Index a freshly written file (same as get, named for call sites)."""
+        return self.get(audio_path)
+
+    def save(self):
+        """Write the index if anything changed (atomic replace)."""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            directory = os.path.dirname(self.index_path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f, ensure_ascii=False)
+                os.replace(tmp_path, self.index_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self._dirty = False
+
+    @staticmethod
+    def _probe(audio_path: str) -> dict:
+        """Measure duration and loudness from the decoded PCM."""
+        samples = load_pcm(audio_path)
+        rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64)))) if len(samples) else 0.0
+        peak = float(np.max(np.abs(samples))) if len(samples) else 0.0
+        return {
+            "duration": len(samples) / SAMPLE_RATE,
+            "rms_db": round(20 * math.log10(rms), 2) if rms > 0 else None,
+            "peak_db": round(20 * math.log10(peak), 2) if peak > 0 else None
+        }
+
+
+# Shared by the TTS, music and video services within one process
+audio_index = AudioIndex()
@@ -0,0 +1,73 @@
+"""Render-ready copies of background images, made when they are fetched."""
+import os
+import tempfile
+from typing import Optional
+import numpy as np
+from PIL import Image
+
+
+def render_ready_path(image_path: str, width: int, height: int) -> str:
+    """Return the render-ready frame path stored next to a background image."""
+    return f"{os.path.splitext(image_path)[0]}_{width}x{height}.npy"
+
+
+def fit_background(image_path: str, width: int, height: int) -> np.ndarray:
+    """
+    Decode an image, center-crop it to the frame aspect ratio and scale it
+    to exactly width x height.
+
+    JPEGs are decoded in draft mode at the smallest DCT scale that still
+    covers the frame, and an image that already has the frame size is
+    used as is.
+    """
+    img = Image.open(image_path)
+    img.draft('RGB', (width, height))
+    img = img.convert('RGB')
+    src_width, src_height = img.size
+    target_ratio = width / height
+
+    if src_width / src_height > target_ratio:
+        # Source is wider than the frame, trim the sides
+        crop_width = int(src_height * target_ratio)
+        left = (src_width - crop_width) // 2
+        img = img.crop((left, 0, left + crop_width, src_height))
+    else:
+        # Source is taller than the frame, trim top and bottom
+        crop_height = int(src_width / target_ratio)
+        top = (src_height - crop_height) // 2
+        img = img.crop((0, top, src_width, top + crop_height))
+
+    if img.size != (width, height):
+        img = img.resize((width, height), Image.Resampling.LANCZOS)
+    return np.array(img)
+
+
+def normalize_background(image_path: str, width: int, height: int) -> str:
+    """
+    Store the render-ready frame of a background image (atomic write).
+
+    Returns:
+        Path to the .npy frame
+    """
+    path = render_ready_path(image_path, width, height)
+    frame = fit_background(image_path, width, height)
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, frame)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return path
+
+
+def load_render_ready(image_path: str, width: int, height: int) -> Optional[np.ndarray]:
+    """Memory-mapped render-ready frame of a background, if it is up to date."""
+    path = render_ready_path(image_path, width, height)
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(image_path):
+        return np.load(path, mmap_mode='r')
+    return None
@@ -0,0 +1,100 @@
+"""Cut per-sentence clips out of finished videos without re-encoding."""
+import os
+import json
+import subprocess
+from typing import List, Optional
+from moviepy.config import get_setting
+
+
+def get_timeline_path(video_path: str) -> str:
+    """Return the timeline sidecar path written next to a video."""
+    return os.path.splitext(video_path)[0] + "_timeline.json"
+
+
+def load_timeline(video_path: str) -> dict:
+    """
+    Load the segment timeline saved by VideoService for a video.
+    
+    Args:
+        video_path: Path to the rendered video
+    
+    Returns:
+        Timeline dictionary with a "segments" list
+    """
+    timeline_path = get_timeline_path(video_path)
+    if not os.path.exists(timeline_path):
+        raise FileNotFoundError(f"Timeline sidecar not found: {timeline_path}")
+    
+    with open(timeline_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def cut_segment(video_path: str, start: float, end: float, output_path: str,
+                fps: Optional[float] = None, video_only: bool = False) -> str:
+    """
+    Copy the [start, end) range of a video into a new file.
+    
+    Streams are copied as-is, so start must fall on a keyframe for the
+    cut to be frame-exact (VideoService forces keyframes at boundaries).
+    When fps is given the video frame count is pinned as well, since
+    B-frame reordering makes a plain duration cut overshoot by a frame or two.
+    """
+    frame_params = []
+    if fps:
+        frame_params = ['-frames:v', str(round((end - start) * fps))]
+    
+    stream_params = ['-map', '0:v', '-an'] if video_only else ['-map', '0']
+    
+    cmd = [
+        get_setting("FFMPEG_BINARY"),
+        '-y',
+        '-loglevel', 'error',
+        '-ss', f"{start:.6f}",
+        '-i', video_path,
+        '-t', f"{end - start:.6f}",
+        *frame_params,
+        *stream_params,
+        '-c', 'copy',
+        '-avoid_negative_ts', 'make_zero',
+        output_path
+    ]
+    
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to cut {video_path}: {result.stderr.strip()}")
+    
+    return output_path
+
+
+def extract_sentence_clips(video_path: str, output_dir: Optional[str] = None,
+                           sentence_numbers: Optional[List[int]] = None) -> List[str]:
+    """
+    Extract each sentence of a video into its own file using stream copy.
+    
+    Args:
+        video_path: Path to a video rendered with a timeline sidecar
+        output_dir: Directory for the clips (defaults to "<video>_clips")
+        sentence_numbers: 1-based sentence numbers to extract (all if None)
+    
+    Returns:
+        List of extracted clip paths
+    """
+    timeline = load_timeline(video_path)
+    
+    if output_dir is None:
+        output_dir = os.path.splitext(video_path)[0] + "_clips"
+    os.makedirs(output_dir, exist_ok=True)
+    
+    clip_paths = []
+    for segment in timeline["segments"]:
+        if segment["type"] != "sentence":
+            continue
+        if sentence_numbers and segment["number"] not in sentence_numbers:
+            continue
+        
+        clip_path = os.path.join(output_dir, f"sentence_{segment['number']:02d}.mp4")
+        cut_segment(video_path, segment["start"], segment["end"], clip_path,
+                    fps=timeline["fps"])
+        clip_paths.append(clip_path)
+    
+    return clip_paths
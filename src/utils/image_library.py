@@ -0,0 +1,212 @@
+"""Index of the background images kept locally, for reuse across videos."""
+import os
+import re
+import json
+import time
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from PIL import Image
+from src.core.config import config
+
+NEAR_DUPLICATE_DISTANCE = 6  # Max differing bits of two perceptual hashes
+
+
+def perceptual_hash(image_path: str) -> str:
+    """64-bit difference hash (dHash) of an image, as 16 hex digits."""
+    img = Image.open(image_path)
+    img.draft('L', (64, 64))
+    pixels = np.asarray(img.convert('L').resize((9, 8), Image.Resampling.LANCZOS), dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return f"{int(''.join('1' if bit else '0' for bit in bits), 2):016x}"
+
+
+def hash_distance(first: str, second: str) -> int:
+    """Number of differing bits between two perceptual hashes."""
+    return bin(int(first, 16) ^ int(second, 16)).count("1")
+
+
+class ImageLibrary:
+    """
+    Background images in the image directory, indexed by file name with
+    theme, search query, source id, dimensions, perceptual hash, last use
+    and use count.
+
+    Images are served again once they have rested for the reuse window
+    (IMAGE_REUSE_DAYS, shared with the search cache's never-repeat
+    ledger), skipping near-duplicates of images used within it. The
+    library is kept under a size budget by evicting the least recently
+    used images together with their render-ready frames.
+    """
+
+    def __init__(self, library_dir: str = None, max_bytes: int = None, reuse_days: float = None):
+        self.library_dir = library_dir or config.image_output_dir
+        self.index_path = os.path.join(self.library_dir, "library.json")
+        self.max_bytes = max_bytes if max_bytes is not None else config.image_library_max_mb * 1024 * 1024
+        self.reuse_window = (reuse_days if reuse_days is not None else config.image_reuse_days) * 86400
+        self._entries: Optional[Dict[str, dict]] = None
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                # A missing or damaged index is rebuilt by sync()
+                self._entries = {}
+        return self._entries
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.library_dir, name)
+
+    def _entry_files(self, name: str, listing: List[str]) -> List[str]:
+        """Files belonging to an entry: the image and its render-ready frames."""
+        frame = re.compile(re.escape(os.path.splitext(name)[0]) + r"_\d+x\d+\.npy$")
+        return [self._path(name)] + [self._path(f) for f in listing if frame.match(f)]
+
+    def add(self, image_path: str, theme: Optional[str] = None, query: Optional[str] = None,
+            source_id: Optional[str] = None) -> dict:
+        """
+        Index an image in the library directory. Images without a source id
+        (placeholders) are tracked for eviction but never served again.
+        """
+        with Image.open(image_path) as img:
+            width, height = img.size
+        entry = {
+            "theme": theme,
+            "query": query,
+            "source_id": source_id,
+            "width": width,
+            "height": height,
+            "phash": perceptual_hash(image_path),
+            "added_at": time.time(),
+            "last_used": None,
+            "use_count": 0
+        }
+        with self._lock:
+            self._load()[os.path.basename(image_path)] = entry
+        return entry
+
+    def find_source(self, source_id: str) -> Optional[str]:
+        """Local path of an image downloaded from a source id, if kept."""
+        with self._lock:
+            for name, entry in self._load().items():
+                if entry["source_id"] == source_id and os.path.exists(self._path(name)):
+                    return self._path(name)
+        return None
+
+    def recent_hashes(self) -> List[str]:
+        """Perceptual hashes of images used within the reuse window."""
+        cutoff = time.time() - self.reuse_window
+        with self._lock:
+            return [entry["phash"] for entry in self._load().values()
+                    if entry["last_used"] and entry["last_used"] >= cutoff]
+
+    def pick(self, theme: str, avoid_hashes: Iterable[str] = (), rested: bool = True) -> Optional[str]:
+        """
+        Pick a rested image of a theme for reuse.
+
+        Args:
+            theme: Image theme
+            avoid_hashes: Perceptual hashes the pick must not resemble
+                (images already used within the reuse window or this video)
+            rested: False also offers images used within the reuse window
+                (when no new images can be fetched)
+
+        Returns:
+            Path of the least used, longest rested image, or None
+        """
+        cutoff = time.time() - self.reuse_window if rested else float("inf")
+        avoid_hashes = list(avoid_hashes)
+        with self._lock:
+            candidates = sorted(
+                ((entry["use_count"], entry["last_used"] or 0, name)
+                 for name, entry in self._load().items()
+                 if entry["theme"] == theme and entry["source_id"]
+                 and (entry["last_used"] or 0) < cutoff),
+            )
+            for _, _, name in candidates:
+                entry = self._entries[name]
+                if not os.path.exists(self._path(name)):
+                    continue
+                if any(hash_distance(entry["phash"], h) <= NEAR_DUPLICATE_DISTANCE for h in avoid_hashes):
+                    continue
+                return self._path(name)
+        return None
+
+    def mark_used(self, image_path: str) -> Optional[dict]:
+        """Record that an image was used in a video."""
+        with self._lock:
+            entry = self._load().get(os.path.basename(image_path))
+            if entry:
+                entry["last_used"] = time.time()
+                entry["use_count"] += 1
+            return entry
+
+    def recent(self, limit: int = 10) -> List[str]:
+        """Paths of the most recently used images, newest first."""
+        with self._lock:
+            used = sorted(((entry["last_used"], name) for name, entry in self._load().items()
+                           if entry["last_used"] and os.path.exists(self._path(name))), reverse=True)
+        return [self._path(name) for _, name in used[:limit]]
+
+    def sync(self):
+        """Drop entries whose image is gone and adopt unindexed backgrounds."""
+        with self._lock:
+            entries = self._load()
+            for name in [name for name in entries if not os.path.exists(self._path(name))]:
+                del entries[name]
+            for name in os.listdir(self.library_dir):
+                if name.startswith("background_") and name.endswith(".jpg") and name not in entries:
+                    try:
+                        self.add(self._path(name))
+                    except Exception:
+                        continue  # Not an image we can index
+                    entries[name]["added_at"] = os.path.getmtime(self._path(name))
+
+    def evict(self, keep: Iterable[str] = ()):
+        """
+        Remove least recently used images until the library fits its budget.
+
+        Args:
+            keep: Image paths that must stay (e.g. the backgrounds of the video being made)
+        """
+        keep = {os.path.basename(path) for path in keep}
+        with self._lock:
+            self.sync()
+            listing = os.listdir(self.library_dir)
+            files = {name: self._entry_files(name, listing) for name in self._entries}
+            sizes = {name: sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+                     for name, paths in files.items()}
+            total = sum(sizes.values())
+            if total <= self.max_bytes:
+                return
+
+            order = sorted(self._entries,
+                           key=lambda name: self._entries[name]["last_used"] or self._entries[name]["added_at"])
+            for name in order:
+                if total <= self.max_bytes:
+                    break
+                if name in keep:
+                    continue
+                for path in files[name]:
+                    if os.path.exists(path):
+                        os.remove(path)
+                total -= sizes[name]
+                del self._entries[name]
+
+    def save(self):
+        """Write the index (atomic replace)."""
+        with self._lock:
+            entries = self._load()
+            fd, tmp_path = tempfile.mkstemp(dir=self.library_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f, ensure_ascii=False, indent=1)
+                os.replace(tmp_path, self.index_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
@@ -0,0 +1,135 @@
+"""On-disk cache of image search results and a ledger of images already used."""
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from typing import Dict, List, Optional
+from src.core.config import config
+
+
+def _write_json(path: str, data):
+    """Write JSON atomically (temp file + rename)."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ImageSearchCache:
+    """
+    Search result pages keyed by (query, page), kept for a TTL.
+
+    Alongside the pages, a ledger records when each image id was last
+    handed out, so pages can be shared across sentences and videos
+    without showing the same image twice within the reuse window. The
+    times of recent search requests are kept too, so each run knows how
+    much of the hourly API quota earlier runs have spent.
+    """
+
+    def __init__(self, cache_dir: str = None, ttl_hours: float = None, reuse_days: float = None):
+        self.cache_dir = cache_dir or config.image_search_cache_dir
+        self.ttl = (ttl_hours if ttl_hours is not None else config.image_search_ttl_hours) * 3600
+        self.reuse_window = (reuse_days if reuse_days is not None else config.image_reuse_days) * 86400
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._ledger_path = os.path.join(self.cache_dir, "used_images.json")
+        self._calls_path = os.path.join(self.cache_dir, "search_calls.json")
+        self._ledger: Optional[Dict[str, float]] = None
+        self._lock = threading.Lock()
+
+    def _page_path(self, query: str, page: int) -> str:
+        identity = json.dumps([query.strip().lower(), page], ensure_ascii=False)
+        return os.path.join(self.cache_dir, hashlib.sha1(identity.encode('utf-8')).hexdigest() + ".json")
+
+    def get(self, query: str, page: int) -> Optional[List[dict]]:
+        """Return the cached results of a page, or None if missing or expired."""
+        path = self._page_path(query, page)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if time.time() - entry["fetched_at"] > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["results"]
+
+    def put(self, query: str, page: int, results: List[dict]):
+        """Store the results of a page."""
+        _write_json(self._page_path(query, page), {
+            "query": query,
+            "page": page,
+            "fetched_at": time.time(),
+            "results": results
+        })
+
+    def _load_ledger(self) -> Dict[str, float]:
+        if self._ledger is None:
+            try:
+                with open(self._ledger_path, 'r', encoding='utf-8') as f:
+                    self._ledger = json.load(f)
+            except (OSError, ValueError):
+                self._ledger = {}
+        return self._ledger
+
+    def is_used(self, image_id: str) -> bool:
+        """Whether an image was handed out within the reuse window."""
+        with self._lock:
+            used_at = self._load_ledger().get(image_id)
+        return used_at is not None and time.time() - used_at < self.reuse_window
+
+    def mark_used(self, image_id: str):
+        """Record that an image was handed out."""
+        with self._lock:
+            self._load_ledger()[image_id] = time.time()
+
+    def save(self):
+        """Write the ledger, dropping ids that left the reuse window."""
+        with self._lock:
+            ledger = self._load_ledger()
+            cutoff = time.time() - self.reuse_window
+            self._ledger = {image_id: used_at for image_id, used_at in ledger.items()
+                            if used_at >= cutoff}
+            _write_json(self._ledger_path, self._ledger)
+
+    def _load_calls(self) -> List[float]:
+        try:
+            with open(self._calls_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def recent_search_calls(self, window: float) -> List[float]:
+        """Times (time.time()) of the search requests made within the last window seconds."""
+        cutoff = time.time() - window
+        with self._lock:
+            return [stamp for stamp in self._load_calls() if stamp >= cutoff]
+
+    def record_search_call(self, window: float):
+        """Record a search request, dropping those older than window seconds."""
+        now = time.time()
+        with self._lock:
+            calls = [stamp for stamp in self._load_calls() if stamp >= now - window]
+            calls.append(now)
+            _write_json(self._calls_path, calls)
+
+    def cleanup(self):
+        """Remove expired result pages."""
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith(".json") and path not in (self._ledger_path, self._calls_path) \
+                    and os.path.getmtime(path) < cutoff:
+                os.remove(path)
@@ -282,6 +282,8 @@ def create_modern_thumbnail(
     # Create base image
     if background_image_path and os.path.exists(background_image_path):
         img = Image.open(background_image_path)
+        # JPEGs decode at a reduced DCT scale that still covers the thumbnail
+        img.draft('RGB', (width, height))
         img = img.resize((width, height), Image.Resampling.LANCZOS)
         
         # Apply modern dark overlay with gradient
@@ -0,0 +1,170 @@
+"""Decoded PCM copies of speech and music assets for subprocess-free mixing."""
+import io
+import os
+import wave
+import tempfile
+import threading
+import subprocess
+from typing import Dict, Optional
+import numpy as np
+from moviepy.audio.AudioClip import AudioArrayClip
+from moviepy.config import get_setting
+from pydub import AudioSegment
+
+# Canonical format every asset is normalized to (matches the mixers' output)
+SAMPLE_RATE = 44100
+CHANNELS = 2
+
+
+def pcm_path(audio_path: str) -> str:
+    """Return the decoded PCM array path stored next to an audio file."""
+    return os.path.splitext(audio_path)[0] + "_pcm.npy"
+
+
+def ensure_pcm(audio_path: str) -> str:
+    """
+    Decode an audio file once to canonical float32 PCM (44.1 kHz stereo).
+
+    The array is rewritten only when the source is newer than it. The
+    container is detected from the data, so gTTS MP3s saved with a .wav
+    name decode correctly.
+
+    Returns:
+        Path to the .npy array
+    """
+    path = pcm_path(audio_path)
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(audio_path):
+        return path
+
+    return save_pcm(audio_path, _ffmpeg_decode(audio_path))
+
+
+def save_pcm(audio_path: str, samples: np.ndarray) -> str:
+    """
+    Store already decoded samples as an audio file's PCM array.
+
+    Write the audio file first: the array must not be older than its source.
+
+    Returns:
+        Path to the .npy array
+    """
+    path = pcm_path(audio_path)
+
+    # Write atomically so concurrent readers never map a partial array
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, samples)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return path
+
+
+def decode_audio(data: bytes) -> np.ndarray:
+    """
+    Decode encoded audio held in memory to canonical PCM.
+
+    16-bit WAV at the canonical rate is converted directly; anything else
+    (MP3, other rates) is piped through ffmpeg without touching the disk.
+    """
+    if data[:4] == b"RIFF":
+        try:
+            with wave.open(io.BytesIO(data), 'rb') as wav:
+                params = wav.getparams()
+                frames = wav.readframes(wav.getnframes())
+        except (wave.Error, EOFError):
+            params = None
+        if params and params.sampwidth == 2 and params.framerate == SAMPLE_RATE:
+            samples = np.frombuffer(frames, dtype='<i2').reshape(-1, params.nchannels)
+            samples = samples.astype(np.float32) / 32768
+            if params.nchannels == 1:
+                samples = np.repeat(samples, CHANNELS, axis=1)
+            if samples.shape[1] == CHANNELS:
+                return samples
+
+    return _ffmpeg_decode("pipe:0", data)
+
+
+def write_wav(audio_path: str, samples: np.ndarray):
+    """Write canonical PCM samples as a 16-bit WAV file."""
+    with wave.open(audio_path, 'wb') as wav:
+        wav.setnchannels(CHANNELS)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes())
+
+
+def _ffmpeg_decode(source: str, data: bytes = None) -> np.ndarray:
+    """Decode a file (or data piped to stdin) with ffmpeg to canonical PCM."""
+    result = subprocess.run([
+        get_setting("FFMPEG_BINARY"),
+        '-loglevel', 'error',
+        '-i', source,
+        '-f', 'f32le',
+        '-acodec', 'pcm_f32le',
+        '-ac', str(CHANNELS),
+        '-ar', str(SAMPLE_RATE),
+        '-'
+    ], input=data, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to decode {'audio data' if data else source}: "
+                           f"{result.stderr.decode(errors='replace').strip()}")
+
+    return np.frombuffer(result.stdout, dtype=np.float32).reshape(-1, CHANNELS)
+
+
+# Samples of utterances synthesized in memory, by audio path. They are
+# served ahead of any file, so audio that was never written still mixes.
+_registry: Dict[str, np.ndarray] = {}
+_registry_lock = threading.Lock()
+
+
+def register_pcm(audio_path: str, samples: np.ndarray):
+    """Make in-memory samples the PCM of an audio path for this process."""
+    samples = np.ascontiguousarray(samples, dtype=np.float32)
+    samples.flags.writeable = False  # Same contract as the read-only memory maps
+    with _registry_lock:
+        _registry[os.path.abspath(audio_path)] = samples
+
+
+def registered_pcm(audio_path: str) -> Optional[np.ndarray]:
+    """In-memory samples of an audio path, or None."""
+    with _registry_lock:
+        return _registry.get(os.path.abspath(audio_path))
+
+
+def release_pcm(audio_path: str):
+    """Drop the in-memory samples of an audio path."""
+    with _registry_lock:
+        _registry.pop(os.path.abspath(audio_path), None)
+
+
+def load_pcm(audio_path: str) -> np.ndarray:
+    """
+    Return the decoded samples of an audio file: the in-memory samples if
+    it was synthesized in this process, else a read-only memory map.
+    """
+    samples = registered_pcm(audio_path)
+    if samples is not None:
+        return samples
+    return np.load(ensure_pcm(audio_path), mmap_mode='r')
+
+
+def pcm_audio_clip(audio_path: str) -> AudioArrayClip:
+    """moviepy audio clip backed by the memory-mapped PCM (no ffmpeg reader)."""
+    return AudioArrayClip(load_pcm(audio_path), fps=SAMPLE_RATE)
+
+
+def pcm_segment(audio_path: str) -> AudioSegment:
+    """pydub segment (16-bit) built from the decoded PCM."""
+    samples = np.clip(load_pcm(audio_path), -1.0, 1.0)
+    return AudioSegment(
+        (samples * 32767).astype('<i2').tobytes(),
+        frame_rate=SAMPLE_RATE,
+        sample_width=2,
+        channels=CHANNELS
+    )
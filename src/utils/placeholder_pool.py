@@ -0,0 +1,180 @@
+"""Placeholder backgrounds, drawn with array math and pre-generated per theme."""
+import os
+import time
+import random
+import tempfile
+from typing import Iterable, Optional
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+from src.core.config import config
+from src.utils.background_ingest import normalize_background, render_ready_path
+
+GRADIENT_STYLES = {
+    "sunset": [(255, 94, 77), (255, 154, 0), (237, 117, 57), (95, 39, 205)],
+    "ocean": [(69, 104, 220), (89, 173, 246), (146, 232, 192), (255, 255, 255)],
+    "forest": [(34, 139, 34), (60, 179, 113), (152, 251, 152), (255, 250, 205)],
+    "purple_dream": [(138, 43, 226), (218, 112, 214), (255, 182, 193), (255, 228, 225)]
+}
+
+# Gradients that suit a theme (other themes use any of them)
+THEME_STYLES = {
+    "nature": ["forest", "ocean", "sunset"],
+    "city": ["sunset", "purple_dream", "ocean"],
+    "study": ["ocean", "forest", "purple_dream"],
+    "abstract": ["purple_dream", "sunset", "ocean", "forest"]
+}
+
+SHAPE_BLUR_RADIUS = 50  # At full resolution
+SHAPE_SCALE = 4  # Shapes are drawn and blurred at 1/SHAPE_SCALE resolution
+
+
+def render_placeholder(width: int, height: int, theme: Optional[str] = None,
+                       rng: Optional[random.Random] = None) -> np.ndarray:
+    """
+    Draw a placeholder background: a vertical multi-color gradient with
+    3-7 soft, semi-transparent white circles and squares.
+
+    The gradient is one interpolated column broadcast across the frame.
+    Each shape is drawn and blurred at reduced resolution over its own
+    bounding box (plus the blur's reach) and blended into that region only.
+
+    Returns:
+        height x width x 3 uint8 frame
+    """
+    rng = rng or random.Random()
+    colors = np.array(GRADIENT_STYLES[rng.choice(THEME_STYLES.get(theme, list(GRADIENT_STYLES)))],
+                      dtype=np.float32)
+
+    # Gradient: interpolate one column, then repeat it across the width
+    segment = np.arange(height, dtype=np.float32) / height * (len(colors) - 1)
+    stops = np.arange(len(colors))
+    column = np.stack([np.interp(segment, stops, colors[:, c]) for c in range(3)], axis=1)
+    frame = np.repeat(column[:, None, :], width, axis=1).astype(np.float32)
+
+    reach = 3 * SHAPE_BLUR_RADIUS  # Where the blur fades out
+    for _ in range(rng.randint(3, 7)):
+        x = rng.randint(0, width)
+        y = rng.randint(0, height)
+        size = rng.randint(100, 400)
+        opacity = rng.randint(20, 60)
+        circle = rng.choice([True, False])
+        half = size if circle else size // 2
+
+        # Affected region of the frame
+        left, top = max(0, x - half - reach), max(0, y - half - reach)
+        right, bottom = min(width, x + half + reach), min(height, y + half + reach)
+        if right <= left or bottom <= top:
+            continue
+
+        # Alpha mask of the region at reduced resolution
+        region_size = (max(1, (right - left) // SHAPE_SCALE), max(1, (bottom - top) // SHAPE_SCALE))
+        mask = Image.new('L', region_size, 0)
+        box = [(x - half - left) / SHAPE_SCALE, (y - half - top) / SHAPE_SCALE,
+               (x + half - left) / SHAPE_SCALE, (y + half - top) / SHAPE_SCALE]
+        draw = ImageDraw.Draw(mask)
+        if circle:
+            draw.ellipse(box, fill=opacity)
+        else:
+            draw.rectangle(box, fill=opacity)
+        mask = mask.filter(ImageFilter.GaussianBlur(radius=SHAPE_BLUR_RADIUS / SHAPE_SCALE))
+        mask = mask.resize((right - left, bottom - top), Image.Resampling.BILINEAR)
+
+        # Blend white into the region
+        alpha = np.asarray(mask, dtype=np.float32)[:, :, None] / 255
+        region = frame[top:bottom, left:right]
+        region += (255 - region) * alpha
+
+    return np.clip(frame + 0.5, 0, 255).astype(np.uint8)
+
+
+def create_placeholder_image(save_path: str, theme: Optional[str] = None) -> str:
+    """Draw a placeholder background at the output size and save it as JPEG."""
+    frame = render_placeholder(config.video_width, config.video_height, theme)
+    Image.fromarray(frame).save(save_path, quality=90)
+    return save_path
+
+
+class PlaceholderPool:
+    """
+    Placeholder backgrounds generated ahead of time, one directory per theme.
+
+    Pool images come with their render-ready frame, so falling back to a
+    placeholder while offline is a file move. The pool is refilled by
+    top_up() when the machine is idle (e.g. between scheduler runs).
+    """
+
+    def __init__(self, pool_dir: str = None, size: int = None):
+        self.pool_dir = pool_dir or config.placeholder_pool_dir
+        self.size = size if size is not None else config.placeholder_pool_size
+
+    def _theme_dir(self, theme: Optional[str]) -> str:
+        return os.path.join(self.pool_dir, theme or "default")
+
+    def _images(self, theme: Optional[str]):
+        theme_dir = self._theme_dir(theme)
+        if not os.path.isdir(theme_dir):
+            return []
+        return sorted(name for name in os.listdir(theme_dir) if name.endswith(".jpg"))
+
+    def available(self, theme: Optional[str]) -> int:
+        """Number of pooled placeholders for a theme."""
+        return len(self._images(theme))
+
+    def take(self, theme: Optional[str], save_path: str) -> Optional[str]:
+        """
+        Move a pooled placeholder (and its render-ready frame) to save_path.
+
+        Returns:
+            save_path, or None if the theme's pool is empty
+        """
+        width, height = config.video_width, config.video_height
+        for name in self._images(theme):
+            path = os.path.join(self._theme_dir(theme), name)
+            frame_path = render_ready_path(path, width, height)
+            try:
+                # Another process may have taken the same image first
+                os.replace(path, save_path)
+            except FileNotFoundError:
+                continue
+            if os.path.exists(frame_path):
+                os.replace(frame_path, render_ready_path(save_path, width, height))
+            return save_path
+        return None
+
+    def top_up(self, themes: Iterable[Optional[str]], budget: float = None) -> int:
+        """
+        Generate placeholders until each theme's pool is full.
+
+        Args:
+            themes: Themes to fill
+            budget: Seconds to spend at most (None fills completely)
+
+        Returns:
+            Number of placeholders generated
+        """
+        started = time.monotonic()
+        created = 0
+        for theme in themes:
+            theme_dir = self._theme_dir(theme)
+            os.makedirs(theme_dir, exist_ok=True)
+            for _ in range(self.size - self.available(theme)):
+                if budget is not None and time.monotonic() - started >= budget:
+                    return created
+                fd, tmp_path = tempfile.mkstemp(dir=theme_dir, suffix=".tmp")
+                os.close(fd)
+                path = os.path.join(theme_dir, f"placeholder_{time.time_ns()}.jpg")
+                try:
+                    # Frame first: a pooled .jpg always comes with its render-ready frame
+                    Image.fromarray(render_placeholder(config.video_width, config.video_height,
+                                                       theme)).save(tmp_path, format='JPEG', quality=90)
+                    os.replace(normalize_background(tmp_path, config.video_width, config.video_height),
+                               render_ready_path(path, config.video_width, config.video_height))
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    for leftover in (tmp_path, render_ready_path(tmp_path, config.video_width,
+                                                                 config.video_height)):
+                        if os.path.exists(leftover):
+                            os.remove(leftover)
+                    raise
+                created += 1
+        return created
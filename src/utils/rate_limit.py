@@ -0,0 +1,188 @@
+"""Client-side limits for calls to rate-limited web services."""
+import time
+import threading
+from collections import deque
+from typing import Iterable
+
+
+class AdaptiveLimiter:
+    """
+    Cap the number of in-flight requests and adapt the cap to throttling.
+
+    The cap is halved whenever the service reports throttling and grows
+    back by one after a run of successful requests (AIMD), never exceeding
+    max_in_flight.
+
+    Usage:
+        with limiter:
+            try:
+                call_service()
+            except ThrottledError:
+                limiter.throttled()
+                raise
+            limiter.succeeded()
+    """
+
+    def __init__(self, max_in_flight: int, min_in_flight: int = 1, increase_after: int = 5):
+        self.max_in_flight = max(1, max_in_flight)
+        self.min_in_flight = max(1, min(min_in_flight, self.max_in_flight))
+        self.increase_after = increase_after
+        self.limit = self.max_in_flight
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+        return False
+
+    def succeeded(self):
+        """Record a successful request; slowly raise the cap again."""
+        with self._condition:
+            self._successes += 1
+            if self._successes >= self.increase_after and self.limit < self.max_in_flight:
+                self.limit += 1
+                self._successes = 0
+                self._condition.notify_all()
+
+    def throttled(self):
+        """Record a throttled request; halve the cap."""
+        with self._condition:
+            self.limit = max(self.min_in_flight, self.limit // 2)
+            self._successes = 0
+
+
+class LatencyTracker:
+    """
+    Recent latencies of a service, used to hedge requests that run longer
+    than a percentile of them.
+
+    Until min_samples latencies are known the initial threshold is used.
+    """
+
+    def __init__(self, percentile: float, initial_threshold: float,
+                 window: int = 100, min_samples: int = 10):
+        self.percentile = percentile
+        self.initial_threshold = initial_threshold
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Record the latency of a completed request."""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def threshold(self) -> float:
+        """Seconds after which a request counts as slow."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_threshold
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[index]
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter: sustains rate requests per second with
+    bursts of up to capacity. acquire() blocks until a token is free.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Take one token, waiting for it if the bucket is empty.
+
+        Returns:
+            False if no token would be free within timeout seconds
+        """
+        give_up = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if give_up is not None and now + wait > give_up:
+                return False
+            time.sleep(wait)
+
+    def spend_past(self, timestamps: Iterable[float]):
+        """
+        Start from the state left by earlier calls instead of a full bucket,
+        e.g. calls made by previous runs against the same quota.
+
+        Args:
+            timestamps: Wall-clock times (time.time()) of the earlier calls
+        """
+        tokens, previous = self.capacity, None
+        for stamp in sorted(timestamps):
+            if previous is not None:
+                tokens = min(self.capacity, tokens + (stamp - previous) * self.rate)
+            tokens -= 1
+            previous = stamp
+        if previous is None:
+            return
+        tokens = min(self.capacity, tokens + max(0.0, time.time() - previous) * self.rate)
+        with self._lock:
+            self._tokens = min(self._tokens, tokens)
+            self._updated = time.monotonic()
+
+
+class CircuitBreaker:
+    """
+    Stop calling a service after a run of consecutive failures.
+
+    Once open, the breaker stays open for its lifetime (one run), so a
+    dead service is not retried for every remaining request.
+    """
+
+    def __init__(self, failure_threshold: int):
+        self.failure_threshold = max(1, failure_threshold)
+        self.failures = 0
+        self.is_open = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may be made."""
+        return not self.is_open
+
+    def succeeded(self):
+        """Record a successful call."""
+        with self._lock:
+            self.failures = 0
+
+    def failed(self) -> bool:
+        """
+        Record a failed call.
+
+        Returns:
+            True if this failure opened the breaker
+        """
+        with self._lock:
+            self.failures += 1
+            if not self.is_open and self.failures >= self.failure_threshold:
+                self.is_open = True
+                return True
+            return False
@@ -0,0 +1,49 @@
+"""Render quality levels used to finish a video before a wall-clock deadline."""
+from dataclasses import dataclass, field, replace
+from datetime import datetime, date, time
+from typing import List
+
+# Headroom for audio mixing, muxing and estimation error
+DEADLINE_SAFETY_FACTOR = 1.25
+
+
+@dataclass
+class RenderProfile:
+    """Encoder and animation settings for one render."""
+    name: str = "full"
+    preset: str = "slow"
+    zoom: bool = True  # Slow zoom on sentence backgrounds
+    animated_intro: bool = True  # Animated intro/outro instead of still frames
+    fps: int = 30  # Frames composed per second (output is still 30 fps)
+    degradations: List[str] = field(default_factory=list)
+
+
+def degradation_ladder() -> List[RenderProfile]:
+    """
+    Return render profiles from full quality to the cheapest settings.
+
+    Each step keeps the savings of the previous ones.
+    """
+    steps = [
+        ("faster preset", {"preset": "veryfast"}),
+        ("no zoom", {"zoom": False}),
+        ("static intro and outro", {"animated_intro": False}),
+        ("lower fps", {"fps": 15}),
+    ]
+
+    profiles = [RenderProfile()]
+    for name, changes in steps:
+        previous = profiles[-1]
+        profiles.append(replace(previous, name=name.replace(" ", "-"),
+                                degradations=previous.degradations + [name],
+                                **changes))
+    return profiles
+
+
+def parse_deadline(value: str) -> datetime:
+    """
+    Parse a deadline given as "HH:MM" (today) or an ISO date and time.
+    """
+    if "T" in value or " " in value or "-" in value:
+        return datetime.fromisoformat(value)
+    return datetime.combine(date.today(), time.fromisoformat(value))
@@ -3,6 +3,7 @@ import os
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 from typing import List, Optional
+from .image_library import ImageLibrary
 from .modern_assets import create_modern_thumbnail
 import random
 
@@ -243,14 +244,9 @@ def generate_thumbnail_from_video_path(video_path: str, sentences: List[tuple])
     
     # Try to use a random image from the video as background
     background_path = None
-    image_dir = os.path.join(os.path.dirname(os.path.dirname(video_path)), 'images')
-    if os.path.exists(image_dir):
-        images = [f for f in os.listdir(image_dir) if f.endswith(('.jpg', '.png'))]
-        if images:
-            # Sort by modification time and use recent images
-            images.sort(key=lambda x: os.path.getmtime(os.path.join(image_dir, x)), reverse=True)
-            # Pick a random image from the most recent ones
-            recent_images = images[:10] if len(images) > 10 else images
-            background_path = os.path.join(image_dir, random.choice(recent_images))
+    # Pick a random image from the most recently used ones (library index, no directory scan)
+    recent_images = ImageLibrary().recent(10)
+    if recent_images:
+        background_path = random.choice(recent_images)
     
     return generate_thumbnail(day_number, sentences, thumbnail_path, background_path)
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""Sentence timing shared by the video and audio-only renderers."""
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+
+# Longer pauses for better learning experience
+AUDIO_LEAD_IN = 0.3        # Start audio shortly after the text appears
+PAUSE_AFTER_AUDIO = 2.0    # Pause after audio completes for comprehension
+PAUSE_BEFORE_REPEAT = 1.0  # Pause before repeating English
+
+INTRO_DURATION = 4.0
+OUTRO_DURATION = 6.0
+
+
+@dataclass
+class SentenceTiming:
+    """Offsets (seconds from the sentence start) of one sentence pair."""
+    en_text_start: float
+    en_audio_start: float
+    en_section_duration: float
+    ko_text_start: float
+    ko_audio_start: float
+    ko_section_duration: float
+    en_repeat_start: float
+    en_repeat_audio_start: float
+    en_repeat_section_duration: float
+    total_duration: float
+
+
+def plan_sentence_timing(en_audio_duration: float, ko_audio_duration: float) -> SentenceTiming:
+    """
+    Lay out the English, Korean and English-repeat sections of a sentence.
+    
+    Args:
+        en_audio_duration: Length of the English narration in seconds
+        ko_audio_duration: Length of the Korean narration in seconds
+    
+    Returns:
+        SentenceTiming with section starts, audio starts and durations
+    """
+    # English section timing
+    en_text_start = 0
+    en_audio_start = AUDIO_LEAD_IN
+    en_section_duration = en_audio_start + en_audio_duration + PAUSE_AFTER_AUDIO
+    
+    # Korean section timing
+    ko_text_start = en_section_duration
+    ko_audio_start = ko_text_start + AUDIO_LEAD_IN
+    ko_section_duration = AUDIO_LEAD_IN + ko_audio_duration + PAUSE_AFTER_AUDIO
+    
+    # English repeat section timing
+    en_repeat_start = en_section_duration + ko_section_duration
+    en_repeat_audio_start = en_repeat_start + PAUSE_BEFORE_REPEAT
+    en_repeat_section_duration = PAUSE_BEFORE_REPEAT + en_audio_duration + PAUSE_AFTER_AUDIO
+    
+    total_duration = en_section_duration + ko_section_duration + en_repeat_section_duration
+    
+    return SentenceTiming(
+        en_text_start=en_text_start,
+        en_audio_start=en_audio_start,
+        en_section_duration=en_section_duration,
+        ko_text_start=ko_text_start,
+        ko_audio_start=ko_audio_start,
+        ko_section_duration=ko_section_duration,
+        en_repeat_start=en_repeat_start,
+        en_repeat_audio_start=en_repeat_audio_start,
+        en_repeat_section_duration=en_repeat_section_duration,
+        total_duration=total_duration
+    )
+
+
+def plan_lesson_duration(audio_files: List[Tuple[str, str]],
+                         duration_of: Callable[[str], float],
+                         with_bookends: bool = True) -> float:
+    """
+    Total length of a lesson from its narration lengths, without rendering.
+    
+    Args:
+        audio_files: List of (english_audio_path, korean_audio_path) tuples
+        duration_of: Returns the duration of an audio file (e.g. the audio index)
+        with_bookends: Include the video intro and outro
+    
+    Returns:
+        Duration in seconds
+    """
+    total = sum(plan_sentence_timing(duration_of(en_path), duration_of(ko_path)).total_duration
+                for en_path, ko_path in audio_files)
+    if with_bookends:
+        total += INTRO_DURATION + OUTRO_DURATION
+    return total
@@ -0,0 +1,186 @@
+"""Content-addressed cache of synthesized TTS audio."""
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import unicodedata
+from typing import Callable, Dict, Optional, Set
+from src.core.config import config
+from src.utils.pcm_cache import ensure_pcm, pcm_path
+from src.utils.word_timings import word_timings_path
+
+
+class TTSCache:
+    """
+    Persistent TTS audio cache keyed by (engine, voice, speed, language, text).
+
+    Entries are written atomically (temp file + rename), so an interrupted
+    run never leaves a truncated clip behind. The cache is kept under a size
+    budget by evicting the least recently used entries; entries used during
+    the current run are never evicted.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        self.cache_dir = cache_dir or config.tts_cache_dir
+        self.max_bytes = max_bytes if max_bytes is not None else config.tts_cache_max_mb * 1024 * 1024
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._in_use: Set[str] = set()
+        self._pending: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._total_bytes = sum(os.path.getsize(os.path.join(self.cache_dir, name))
+                                for name in os.listdir(self.cache_dir))
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text so trivially different spellings share an entry."""
+        text = unicodedata.normalize("NFC", text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    def make_key(self, engine: str, voice: str, speed: float, language: str, text: str) -> str:
+        """Build the cache key for one utterance."""
+        identity = json.dumps([engine, voice, float(speed), language, self.normalize_text(text)],
+                              ensure_ascii=False)
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def get_or_create(self, key: str, synthesize: Callable[[str], str]) -> str:
+        """
+        Return the cached audio path for key, synthesizing it on a miss.
+
+        Args:
+            key: Key from make_key
+            synthesize: Called with a temporary path to write the audio to
+                (and its word timing sidecar and decoded PCM, if available).
+                It may return another key to store the result under, e.g.
+                when a fallback engine produced the audio.
+
+        Returns:
+            Path of the cached audio file
+        """
+        path = os.path.join(self.cache_dir, key + ".wav")
+
+        with self._lock:
+            self._in_use.add(key)
+            if os.path.exists(path):
+                self.hits += 1
+                self._touch(path)
+                return path
+
+            pending = self._pending.get(key)
+            if pending is None:
+                self.misses += 1
+                self._pending[key] = threading.Event()
+
+        if pending is not None:
+            # Another thread is synthesizing the same utterance; reuse its result
+            pending.wait()
+            return self.get_or_create(key, synthesize)
+
+        tmp_path = self.temp_path(key)
+        try:
+            stored_key = synthesize(tmp_path) or key
+            return self.store(stored_key, tmp_path)
+        finally:
+            self.discard(tmp_path)
+            with self._lock:
+                self._pending.pop(key).set()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the cached audio path for key, or None on a miss."""
+        path = os.path.join(self.cache_dir, key + ".wav")
+        with self._lock:
+            self._in_use.add(key)
+            if os.path.exists(path):
+                self.hits += 1
+                self._touch(path)
+                return path
+            self.misses += 1
+            return None
+
+    def temp_path(self, key: str) -> str:
+        """A private path inside the cache directory to synthesize key into."""
+        return os.path.join(self.cache_dir, f"{key}.{os.getpid()}.{threading.get_ident()}.tmp.wav")
+
+    def store(self, key: str, tmp_path: str) -> str:
+        """
+        Move audio written at tmp_path (from temp_path) into the cache.
+
+        Returns:
+            Path of the cached audio file
+        """
+        path = os.path.join(self.cache_dir, key + ".wav")
+
+        # Publish the sidecar first; the audio file marks a complete entry
+        tmp_words, words = word_timings_path(tmp_path), word_timings_path(path)
+        if os.path.exists(tmp_words):
+            os.replace(tmp_words, words)
+        elif os.path.exists(words):
+            os.remove(words)
+        os.replace(tmp_path, path)
+        # Decoded PCM is part of the entry (written after the audio, so it stays fresh)
+        if os.path.exists(pcm_path(tmp_path)):
+            os.replace(pcm_path(tmp_path), pcm_path(path))
+        ensure_pcm(path)
+
+        with self._lock:
+            self._in_use.add(key)
+            self._total_bytes += self._entry_size(key)
+            self._evict()
+
+        return path
+
+    def discard(self, tmp_path: str):
+        """Remove whatever was written at a temp_path and not stored (e.g. after a failure)."""
+        for leftover in self._entry_files(tmp_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    @staticmethod
+    def _entry_files(path: str) -> list:
+        """Files belonging to an entry: audio, word timings and decoded PCM."""
+        return [path, word_timings_path(path), pcm_path(path)]
+
+    def _touch(self, path: str):
+        """
+        Mark an entry as recently used. Access time is the LRU timestamp;
+        modification times are kept so derived data stays valid.
+        """
+        now = time.time_ns()
+        for file_path in self._entry_files(path):
+            if os.path.exists(file_path):
+                os.utime(file_path, ns=(now, os.stat(file_path).st_mtime_ns))
+
+    def _entry_size(self, key: str) -> int:
+        """Bytes used by an entry."""
+        path = os.path.join(self.cache_dir, key + ".wav")
+        size = 0
+        for file_path in self._entry_files(path):
+            if os.path.exists(file_path):
+                size += os.path.getsize(file_path)
+        return size
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its budget."""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".wav") and ".tmp." not in name:
+                key = name[:-len(".wav")]
+                if key not in self._in_use:
+                    entries.append((os.path.getatime(os.path.join(self.cache_dir, name)), key))
+
+        for _, key in sorted(entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            size = self._entry_size(key)
+            path = os.path.join(self.cache_dir, key + ".wav")
+            for file_path in self._entry_files(path):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+            self._total_bytes -= size
@@ -0,0 +1,66 @@
+"""Word timing sidecars written next to TTS audio files."""
+import os
+import json
+import threading
+from typing import Dict, List, Optional
+
+# Timings of utterances synthesized in memory, by audio path
+_registry: Dict[str, List[dict]] = {}
+_registry_lock = threading.Lock()
+
+
+def word_timings_path(audio_path: str) -> str:
+    """Return the word timing sidecar path for an audio file."""
+    return os.path.splitext(audio_path)[0] + "_words.json"
+
+
+def save_word_timings(audio_path: str, words: List[dict]) -> str:
+    """
+    Save word timings for an audio file.
+    
+    Args:
+        audio_path: Audio file the timings belong to
+        words: List of {"word", "start", "end"} dicts (seconds from audio start)
+    
+    Returns:
+        Path to the sidecar file
+    """
+    path = word_timings_path(audio_path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(words, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def register_word_timings(audio_path: str, words: List[dict]):
+    """Keep word timings of an in-memory utterance for this process."""
+    with _registry_lock:
+        _registry[os.path.abspath(audio_path)] = words
+
+
+def release_word_timings(audio_path: str):
+    """Drop the in-memory word timings of an audio path."""
+    with _registry_lock:
+        _registry.pop(os.path.abspath(audio_path), None)
+
+
+def load_word_timings(audio_path: str) -> Optional[List[dict]]:
+    """Load word timings for an audio file, or None if there are none."""
+    with _registry_lock:
+        words = _registry.get(os.path.abspath(audio_path))
+    if words is not None:
+        return words or None
+    
+    path = word_timings_path(audio_path)
+    if not os.path.exists(path):
+        return None
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        words = json.load(f)
+    return words or None
+
+
+def clear_word_timings(audio_path: str):
+    """Remove a stale sidecar when an engine cannot report word timings."""
+    path = word_timings_path(audio_path)
+    if os.path.exists(path):
+        os.remove(path)
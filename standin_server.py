@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+외부 서비스 대역 서버
+Unsplash 검색/이미지, bensound 음악, Azure Speech(REST), Google TTS가 사용하는 엔드포인트를
+로컬에서 흉내 내어, 네트워크 없이 전체 파이프라인의 동시성·캐시·장애 처리를 부하 테스트할 수 있게 합니다.
+응답 지연, 오류율, 응답 없음, 요청 제한(429)을 서비스별로 설정하거나 기록된 지연 분포에서 재현합니다.
+
+사용 예:
+    python standin_server.py --port 8765 --profile profile.json
+    UNSPLASH_API_URL=http://127.0.0.1:8765 BENSOUND_URL=http://127.0.0.1:8765 \\
+    AZURE_TTS_ENDPOINT=http://127.0.0.1:8765 GTTS_URL=http://127.0.0.1:8765 \\
+    TTS_ENGINE=azure_rest UNSPLASH_ACCESS_KEY=test AZURE_SPEECH_KEY=test python main.py input.csv
+"""
+
+import io
+import os
+import re
+import json
+import math
+import time
+import wave
+import base64
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+import numpy as np
+from PIL import Image
+from pydub import AudioSegment
+from src.services.tts_service import LocalTTS
+from src.utils.pcm_cache import CHANNELS, SAMPLE_RATE
+from src.utils.placeholder_pool import render_placeholder
+from src.utils.rate_limit import TokenBucket
+
+# Per service: latency (seconds, see LatencyModel), share of requests failing
+# with error_status, share left hanging for hang_seconds, and throttling
+# (429 beyond requests_per_second with bursts of burst)
+DEFAULT_PROFILE = {
+    "unsplash": {"latency": {"median": 0.3, "sigma": 0.4}, "requests_per_second": None},
+    "images": {"latency": {"median": 0.15, "sigma": 0.5}},
+    "music": {"latency": {"median": 0.5, "sigma": 0.3}},
+    "azure": {"latency": {"median": 0.4, "sigma": 0.35}, "requests_per_second": 20, "burst": 20},
+    "gtts": {"latency": {"median": 0.6, "sigma": 0.5}, "requests_per_second": 5, "burst": 10},
+}
+SERVICE_DEFAULTS = {"error_rate": 0.0, "error_status": 503, "hang_rate": 0.0, "hang_seconds": 300,
+                    "requests_per_second": None, "burst": None}
+
+SEARCH_RESULTS = 300  # Results per query, spread over pages
+LATENCY_SAMPLES = 10000  # Latencies kept per service for the percentiles (uniform sample)
+MUSIC_SECONDS = 60
+
+
+class LatencyModel:
+    """
+    Response delay of a stand-in service, one of:
+        0.2                                  fixed seconds
+        {"min": 0.1, "max": 0.5}             uniform
+        {"median": 0.3, "sigma": 0.4}        log-normal
+        {"samples": [0.21, 0.35, ...]}       recorded latencies, resampled
+        {"samples_file": "latencies.json"}   same, from a JSON list or one value per line
+    """
+
+    def __init__(self, spec, scale: float = 1.0):
+        self.scale = scale
+        self.samples = None
+        if isinstance(spec, (int, float)):
+            spec = {"min": spec, "max": spec}
+        if "samples_file" in spec:
+            with open(spec["samples_file"], 'r', encoding='utf-8') as f:
+                text = f.read()
+            try:
+                spec = {"samples": json.loads(text)}
+            except ValueError:
+                spec = {"samples": [float(line) for line in text.split() if line]}
+        if "samples" in spec:
+            self.samples = [float(sample) for sample in spec["samples"]]
+            if not self.samples:
+                raise ValueError("Recorded latency distribution has no samples")
+        self.spec = spec
+
+    def sample(self, rng: random.Random) -> float:
+        if self.samples is not None:
+            seconds = rng.choice(self.samples)
+        elif "median" in self.spec:
+            seconds = self.spec["median"] * math.exp(rng.gauss(0, self.spec.get("sigma", 0.0)))
+        else:
+            seconds = rng.uniform(self.spec.get("min", 0.0), self.spec.get("max", 0.0))
+        return seconds * self.scale
+
+
+class StandinService:
+    """Fault injection and counters for one stand-in service."""
+
+    def __init__(self, name: str, settings: dict, rng: random.Random, rng_lock: threading.Lock,
+                 latency_scale: float = 1.0):
+        self.name = name
+        self.settings = {**SERVICE_DEFAULTS, **settings}
+        self.latency = LatencyModel(self.settings.get("latency", 0), latency_scale)
+        rate = self.settings["requests_per_second"]
+        self.limiter = TokenBucket(rate, self.settings["burst"]) if rate else None
+        self.statuses = Counter()
+        self.delays = []  # Reservoir sample of at most LATENCY_SAMPLES served latencies
+        self._delays_seen = 0
+        # Separate generator, so sampling doesn't shift the seeded fault sequence
+        self._reservoir_rng = random.Random(name)
+        self._rng = rng
+        self._rng_lock = rng_lock
+        self._stats_lock = threading.Lock()
+
+    def admit(self) -> Optional[int]:
+        """
+        Delay a request like the real service would.
+
+        Returns:
+            An error status to answer with, or None to serve the request
+        """
+        with self._rng_lock:
+            delay = self.latency.sample(self._rng)
+            roll = self._rng.random()
+        if self.limiter and not self.limiter.acquire(timeout=0):
+            return 429  # Throttled requests are answered right away
+        if roll < self.settings["hang_rate"]:
+            time.sleep(self.settings["hang_seconds"])
+            return 504
+        time.sleep(delay)
+        self._record_delay(delay)
+        if roll < self.settings["hang_rate"] + self.settings["error_rate"]:
+            return self.settings["error_status"]
+        return None
+
+    def _record_delay(self, delay: float):
+        """Keep a uniform sample of the served latencies (reservoir sampling)."""
+        with self._stats_lock:
+            self._delays_seen += 1
+            if len(self.delays) < LATENCY_SAMPLES:
+                self.delays.append(delay)
+            else:
+                slot = self._reservoir_rng.randrange(self._delays_seen)
+                if slot < LATENCY_SAMPLES:
+                    self.delays[slot] = delay
+
+    def count(self, status: int):
+        with self._stats_lock:
+            self.statuses[status] += 1
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            delays = sorted(self.delays)
+            statuses = dict(self.statuses)
+
+        def percentile(p: float) -> Optional[float]:
+            return round(delays[min(len(delays) - 1, int(len(delays) * p / 100))], 3) if delays else None
+
+        return {"requests": sum(statuses.values()), "statuses": statuses,
+                "latency_p50": percentile(50), "latency_p95": percentile(95)}
+
+
+class Fixtures:
+    """Response bodies: files from a fixture directory, else synthesized (deterministic)."""
+
+    def __init__(self, fixture_dir: Optional[str] = None):
+        self.fixture_dir = fixture_dir
+        self.tts = LocalTTS(latency=0, jitter=0)
+        # Recently served bodies per kind, least recently used first
+        self._cache = {"image": OrderedDict(), "music": OrderedDict()}
+        self._cache_lock = threading.Lock()
+
+    def _cached(self, kind: str, key: tuple, max_entries: int, build) -> bytes:
+        """Return a cached body, building (and caching) it if missing."""
+        cache = self._cache[kind]
+        with self._cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        body = build()
+        with self._cache_lock:
+            cache[key] = body
+            while len(cache) > max_entries:
+                cache.popitem(last=False)
+        return body
+
+    def _files(self, kind: str, extensions: Tuple[str, ...]):
+        directory = os.path.join(self.fixture_dir, kind) if self.fixture_dir else None
+        if not directory or not os.path.isdir(directory):
+            return []
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                      if name.lower().endswith(extensions))
+
+    def search_page(self, host: str, query: str, page: int, per_page: int) -> dict:
+        """Unsplash /search/photos response with ids stable per query and position."""
+        total_pages = math.ceil(SEARCH_RESULTS / per_page)
+        results = []
+        for position in range((page - 1) * per_page, min(page * per_page, SEARCH_RESULTS)):
+            photo_id = hashlib.sha1(f"{query.lower()}:{position}".encode('utf-8')).hexdigest()[:11]
+            raw_url = f"http://{host}/photos/{photo_id}?ixlib=standin"
+            results.append({
+                "id": photo_id,
+                "description": f"{query} #{position + 1}",
+                "urls": {"raw": raw_url, "full": raw_url,
+                         "regular": f"{raw_url}&w=1080", "small": f"{raw_url}&w=400"},
+                "links": {"download": f"http://{host}/photos/{photo_id}/download"},
+                "user": {"name": "Stand-in Photographer"}
+            })
+        return {"total": SEARCH_RESULTS, "total_pages": total_pages, "results": results}
+
+    def image(self, photo_id: str, width: int, height: int) -> bytes:
+        """JPEG for a photo id at the requested size."""
+        return self._cached("image", (photo_id, width, height), 64,
+                            lambda: self._make_image(photo_id, width, height))
+
+    def _make_image(self, photo_id: str, width: int, height: int) -> bytes:
+        files = self._files("images", (".jpg", ".jpeg", ".png"))
+        if files:
+            img = Image.open(files[int(hashlib.sha1(photo_id.encode()).hexdigest(), 16) % len(files)])
+            img = img.convert('RGB').resize((width, height), Image.Resampling.LANCZOS)
+        else:
+            img = Image.fromarray(render_placeholder(width, height, rng=random.Random(photo_id)))
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=85)
+        return buffer.getvalue()
+
+    def music(self, name: str) -> bytes:
+        """MP3 track: a fixture file of that name, else a soft chord loop."""
+        return self._cached("music", (name,), 8, lambda: self._make_music(name))
+
+    def _make_music(self, name: str) -> bytes:
+        for path in self._files("music", (".mp3",)):
+            if os.path.basename(path) == name:
+                with open(path, 'rb') as f:
+                    return f.read()
+        seed = int(hashlib.sha1(name.encode()).hexdigest(), 16) % 12
+        t = np.arange(MUSIC_SECONDS * SAMPLE_RATE) / SAMPLE_RATE
+        root = 220.0 * 2 ** (seed / 12)
+        chord = sum(np.sin(2 * np.pi * root * ratio * t) for ratio in (1.0, 1.25, 1.5))
+        swell = 0.6 + 0.4 * np.sin(2 * np.pi * t / 8)
+        samples = (0.1 * chord * swell * 32767).astype('<i2')
+        segment = AudioSegment(np.repeat(samples[:, None], CHANNELS, axis=1).tobytes(),
+                               sample_width=2, frame_rate=SAMPLE_RATE, channels=CHANNELS)
+        buffer = io.BytesIO()
+        segment.export(buffer, format="mp3")
+        return buffer.getvalue()
+
+    def speech(self, text: str, language: str) -> np.ndarray:
+        """Mono 16-bit speech stand-in (a tone as long as the text)."""
+        samples, _ = self.tts.synthesize(text, language)
+        return (np.clip(samples[:, 0], -1.0, 1.0) * 32767).astype('<i2')
+
+    def azure_speech(self, ssml: str) -> bytes:
+        """RIFF 44.1 kHz 16-bit mono, as requested by AzureRestTTS."""
+        language = "ko" if re.search(r'xml:lang="ko', ssml) else "en"
+        text = re.sub(r"<[^>]+>", " ", ssml)
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes(self.speech(" ".join(text.split()), language).tobytes())
+        return buffer.getvalue()
+
+    def gtts_speech(self, text: str, language: str) -> bytes:
+        """MP3 at 24 kHz mono, like Google Translate's TTS."""
+        segment = AudioSegment(self.speech(text, language).tobytes(), sample_width=2,
+                               frame_rate=SAMPLE_RATE, channels=1).set_frame_rate(24000)
+        buffer = io.BytesIO()
+        segment.export(buffer, format="mp3")
+        return buffer.getvalue()
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real services
+    services = {}
+    fixtures: Fixtures = None
+
+    def log_message(self, format, *args):
+        pass  # Per-request logs would dominate a load test; see /__stats
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json",
+              headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _serve(self, service_name: str, respond):
+        """Inject the service's faults, then answer with respond() -> (body, content type)."""
+        service = self.services[service_name]
+        status = service.admit()
+        try:
+            if status is None:
+                body, content_type = respond()
+                self._send(200, body, content_type)
+                status = 200
+            elif status == 429:
+                self._send(429, b'{"errors": ["Rate Limit Exceeded"]}', headers={"Retry-After": "1"})
+            else:
+                self._send(status, b'{"errors": ["Injected failure"]}')
+        except (BrokenPipeError, ConnectionResetError):
+            status = 499  # Client gave up (timed out)
+        service.count(status)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+
+        if url.path == "/__stats":
+            stats = {name: service.stats() for name, service in self.services.items()}
+            self._send(200, json.dumps(stats, indent=1).encode())
+        elif url.path == "/search/photos":
+            if not self.headers.get("Authorization", "").startswith("Client-ID "):
+                self._send(401, b'{"errors": ["OAuth error: The access token is invalid"]}')
+                return
+            per_page = min(30, int(params.get("per_page", 10)))
+            page = max(1, int(params.get("page", 1)))
+            self._serve("unsplash", lambda: (json.dumps(self.fixtures.search_page(
+                self.headers.get("Host"), params.get("query", ""), page, per_page)).encode(),
+                "application/json"))
+        elif url.path.startswith("/photos/"):
+            photo_id = url.path.split("/")[2]
+            # Photos are 16:9; a missing side follows from the other (fit=max)
+            if "w" in params:
+                width = int(params["w"])
+                height = int(params.get("h", round(width * 9 / 16)))
+            else:
+                height = int(params.get("h", 1080))
+                width = round(height * 16 / 9)
+            self._serve("images", lambda: (self.fixtures.image(photo_id, width, height), "image/jpeg"))
+        elif url.path.startswith("/bensound-music/"):
+            name = os.path.basename(url.path)
+            self._serve("music", lambda: (self.fixtures.music(name), "audio/mpeg"))
+        else:
+            self._send(404, b'{"errors": ["Not found"]}')
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        body = self._body()
+
+        if url.path == "/cognitiveservices/v1":
+            if not self.headers.get("Ocp-Apim-Subscription-Key"):
+                self._send(401)
+                return
+            ssml = body.decode('utf-8')
+            self._serve("azure", lambda: (self.fixtures.azure_speech(ssml), "audio/wav"))
+        elif url.path == "/_/TranslateWebserverUi/data/batchexecute":
+            # f.req=[[["jQ1olc", "[text, lang, speed, null]", null, "generic"]]]
+            request = json.loads(unquote(body.decode('ascii')).split("f.req=", 1)[1].rstrip("&"))
+            text, language = json.loads(request[0][0][1])[:2]
+            def respond():
+                audio = base64.b64encode(self.fixtures.gtts_speech(text, language)).decode('ascii')
+                # Compact separators: gTTS finds the audio with a regular expression
+                line = json.dumps(["wrb.fr", "jQ1olc", json.dumps([audio]), None, None, None, "generic"],
+                                  separators=(",", ":"))
+                return f")]}}'\n\n[{line}]\n".encode('ascii'), "application/json"
+            self._serve("gtts", respond)
+        else:
+            self._send(404, b'{"errors": ["Not found"]}')
+
+
+def load_profile(path: Optional[str]) -> dict:
+    """Default profile with the services overridden by a JSON profile file."""
+    profile = {name: dict(settings) for name, settings in DEFAULT_PROFILE.items()}
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            for name, settings in json.load(f).items():
+                if name not in profile:
+                    raise ValueError(f"Unknown service in profile: {name} "
+                                     f"(expected one of {', '.join(profile)})")
+                profile[name].update(settings)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for Unsplash, bensound, Azure Speech (REST) and Google TTS"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="Port to listen on (default: 8765)"
+    )
+    parser.add_argument(
+        "--profile",
+        help="JSON file with per-service latency, error, hang and throttling settings"
+    )
+    parser.add_argument(
+        "--fixtures",
+        help="Directory with images/ and music/ files to serve instead of synthesized ones"
+    )
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=1.0,
+        help="Multiply every latency (0 for no delay)"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        help="Failure rate for every service (overrides the profile)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for latencies and failures (default: 0)"
+    )
+
+    args = parser.parse_args()
+
+    profile = load_profile(args.profile)
+    rng, rng_lock = random.Random(args.seed), threading.Lock()
+    services = {}
+    for name, settings in profile.items():
+        if args.error_rate is not None:
+            settings["error_rate"] = args.error_rate
+        services[name] = StandinService(name, settings, rng, rng_lock, args.latency_scale)
+
+    StandinHandler.services = services
+    StandinHandler.fixtures = Fixtures(args.fixtures)
+    server = ThreadingHTTPServer((args.host, args.port), StandinHandler)
+    server.daemon_threads = True
+
+    base_url = f"http://{args.host}:{server.server_port}"
+    print(f"🧪 Stand-in services listening on {base_url}")
+    print(f"   UNSPLASH_API_URL={base_url} BENSOUND_URL={base_url} "
+          f"AZURE_TTS_ENDPOINT={base_url} GTTS_URL={base_url}")
+    print(f"   Stats: {base_url}/__stats")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("\n📊 Requests served:")
+        for name, service in services.items():
+            stats = service.stats()
+            if stats["requests"]:
+                print(f"   {name}: {stats['requests']} requests, statuses {stats['statuses']}, "
+                      f"p50 {stats['latency_p50']}s, p95 {stats['latency_p95']}s")
+
+
+if __name__ == "__main__":
+    main()